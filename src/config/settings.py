@@ -71,6 +71,22 @@ class Settings(BaseSettings):
         default="confluence_docs", description="Collection name"
     )
     vectordb_persist: bool = Field(default=True, description="Enable persistence")
+    vectordb_insert_batch_size: int = Field(
+        default=200, ge=1, description="Documents per ChromaDB add call during ingestion"
+    )
+    hnsw_m: int = Field(default=24, ge=2, description="HNSW graph links per node (hnsw:M)")
+    hnsw_construction_ef: int = Field(
+        default=128, ge=1, description="HNSW candidate list size at build time"
+    )
+    hnsw_search_ef: int = Field(
+        default=100, ge=1, description="HNSW candidate list size at query time"
+    )
+    hnsw_batch_size: int = Field(
+        default=1000, ge=1, description="Vectors buffered before ChromaDB updates the HNSW index"
+    )
+    hnsw_sync_threshold: int = Field(
+        default=10000, ge=1, description="Vectors added before the HNSW index is synced to disk"
+    )
 
     # Embedding Configuration
     embedding_model: str = Field(
@@ -91,6 +107,15 @@ class Settings(BaseSettings):
     rag_max_context_length: int = Field(
         default=2000, ge=100, description="Maximum context length for LLM"
     )
+    rag_semantic_cache_enabled: bool = Field(
+        default=False, description="Cache retrieval results for semantically equivalent queries"
+    )
+    rag_semantic_cache_threshold: float = Field(
+        default=0.95, ge=0.0, le=1.0, description="Cosine similarity required for a cache hit"
+    )
+    rag_semantic_cache_ttl: int = Field(
+        default=300, ge=1, description="Seconds a cached retrieval result stays valid"
+    )
 
     # Retry Configuration
     retry_max_attempts: int = Field(default=3, ge=1, description="Maximum retry attempts")
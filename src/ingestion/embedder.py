@@ -2,6 +2,7 @@
 
 from typing import List
 
+import numpy as np
 from sentence_transformers import SentenceTransformer
 from loguru import logger
 
@@ -59,7 +60,7 @@ class Embedder:
             logger.error(f"Error generating embedding: {e}")
             raise
 
-    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
         """
         Generate embeddings for multiple texts in batch.
 
@@ -67,10 +68,10 @@ class Embedder:
             texts: List of input texts
 
         Returns:
-            List of embedding vectors
+            float32 array of shape (len(texts), embedding dimension)
         """
         if not texts:
-            return []
+            return np.empty((0, self.get_embedding_dimension()), dtype=np.float32)
 
         try:
             logger.debug(f"Generating embeddings for {len(texts)} texts")
@@ -82,7 +83,7 @@ class Embedder:
                 convert_to_numpy=True,
             )
 
-            return [emb.tolist() for emb in embeddings]
+            return np.asarray(embeddings, dtype=np.float32)
 
         except Exception as e:
             logger.error(f"Error generating batch embeddings: {e}")
@@ -60,6 +60,7 @@ async def lifespan(app: FastAPI):
 
         # Initialize Teams client (optional)
         teams_client = TeamsClient(settings)
+        await teams_client.startup()
 
         # Initialize orchestrator
         global orchestrator
@@ -72,9 +73,19 @@ async def lifespan(app: FastAPI):
             teams_client=teams_client,
         )
 
+        # The SMTP controller runs its own event loop in a thread; hand emails
+        # back to the application loop, which owns the shared HTTP clients
+        app_loop = asyncio.get_running_loop()
+
+        async def dispatch_email(parsed_email: dict) -> None:
+            future = asyncio.run_coroutine_threadsafe(
+                orchestrator.process_email(parsed_email), app_loop
+            )
+            await asyncio.wrap_future(future)
+
         # Start SMTP server
         global smtp_server
-        smtp_server = SMTPServer(settings, email_callback=orchestrator.process_email)
+        smtp_server = SMTPServer(settings, email_callback=dispatch_email)
         smtp_server.start()
 
         logger.info("RAG Incident System started successfully")
@@ -93,6 +104,11 @@ async def lifespan(app: FastAPI):
     if smtp_server:
         smtp_server.stop()
 
+    if orchestrator:
+        await orchestrator.servicenow_client.aclose()
+        if orchestrator.teams_client:
+            await orchestrator.teams_client.aclose()
+
     logger.info("RAG Incident System shut down successfully")
 
 
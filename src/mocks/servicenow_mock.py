@@ -1,7 +1,8 @@
 """Mock ServiceNow API server for testing."""
 
 from typing import Dict, Any, List
-from datetime import datetime
+from datetime import datetime, timezone
+import gzip
 import uuid
 
 from fastapi import FastAPI, HTTPException, Header, Response
@@ -44,7 +45,45 @@ class IncidentResponse(BaseModel):
     sys_updated_on: str
 
 
+class GzipRequestMiddleware:
+    """Decompress gzip-encoded request bodies, as a real ServiceNow instance does."""
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or (b"content-encoding", b"gzip") not in scope["headers"]:
+            await self.app(scope, receive, send)
+            return
+
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+        body = gzip.decompress(body)
+
+        headers = [
+            (name, value)
+            for name, value in scope["headers"]
+            if name not in (b"content-encoding", b"content-length")
+        ]
+        headers.append((b"content-length", str(len(body)).encode()))
+        replayed = False
+
+        async def replay_receive() -> Dict[str, Any]:
+            nonlocal replayed
+            if replayed:
+                return await receive()
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        await self.app({**scope, "headers": headers}, replay_receive, send)
+
+
 app = FastAPI(title="Mock ServiceNow API", version="1.0.0")
+app.add_middleware(GzipRequestMiddleware)
 
 
 def calculate_priority(urgency: int, impact: int) -> int:
@@ -91,7 +130,7 @@ async def create_incident(
     # Generate unique identifiers
     sys_id = str(uuid.uuid4())
     incident_number = f"INC{len(incidents_db) + 1:07d}"
-    timestamp = datetime.utcnow().isoformat() + "Z"
+    timestamp = datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
 
     # Calculate priority
     priority = calculate_priority(incident.urgency, incident.impact)
@@ -178,7 +217,7 @@ async def update_incident(
     # Update incident
     incident = incidents_db[sys_id]
     incident.update(updates)
-    incident["sys_updated_on"] = datetime.utcnow().isoformat() + "Z"
+    incident["sys_updated_on"] = datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
 
     return {"result": IncidentResponse(**incident)}
 
@@ -1,5 +1,7 @@
 """Main workflow orchestration logic."""
 
+import asyncio
+import hashlib
 from typing import Dict, Any, Optional
 
 from loguru import logger
@@ -42,12 +44,62 @@ class WorkflowOrchestrator:
         self.incident_builder = incident_builder
         self.teams_client = teams_client
 
+        # In-flight workflows keyed by email content, so duplicate deliveries of
+        # the same email share one run instead of creating duplicate incidents
+        self._inflight: Dict[str, asyncio.Task] = {}
+
         logger.info("Initialized WorkflowOrchestrator")
 
+    @staticmethod
+    def _email_key(parsed_email: Dict[str, Any]) -> str:
+        """
+        Build a deduplication key from the email sender, subject and body.
+
+        Args:
+            parsed_email: Parsed email data
+
+        Returns:
+            SHA-256 hex digest identifying the email content
+        """
+        parts = (
+            parsed_email.get("from", ""),
+            parsed_email.get("subject", ""),
+            parsed_email.get("body", ""),
+        )
+        return hashlib.sha256("\0".join(map(str, parts)).encode("utf-8")).hexdigest()
+
     async def process_email(self, parsed_email: Dict[str, Any]) -> Dict[str, Any]:
         """
         Process incoming email and create ServiceNow incident.
 
+        Concurrent calls for an identical email (same sender, subject and body)
+        are coalesced: only the first runs the workflow and the others await
+        its result. Each caller gets its own shallow copy of the result dict.
+
+        Args:
+            parsed_email: Parsed email data
+
+        Returns:
+            Workflow result with incident details
+        """
+        key = self._email_key(parsed_email)
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._run_workflow(parsed_email))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            logger.info("Identical email is already being processed, awaiting its result")
+
+        # Shield so a cancelled caller doesn't cancel the run other callers share
+        result = await asyncio.shield(task)
+        return dict(result)
+
+    async def _run_workflow(self, parsed_email: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the incident creation workflow for one email.
+
         Workflow:
         1. Extract incident information from email
         2. Search knowledge base using RAG
@@ -73,7 +125,7 @@ class WorkflowOrchestrator:
 
             # Step 2: Retrieve relevant context from knowledge base
             logger.info("Retrieving relevant knowledge base articles...")
-            retrieval_result = self.retriever.retrieve_with_context(query)
+            retrieval_result = await self.retriever.retrieve_with_context(query)
 
             context = retrieval_result.get("context", "")
             sources = retrieval_result.get("sources", [])
@@ -112,7 +164,7 @@ class WorkflowOrchestrator:
             )
 
             # Step 6: Send Teams notification (if enabled)
-            if self.teams_client:
+            if self.teams_client and self.teams_client.is_enabled:
                 try:
                     logger.info("Sending Teams notification...")
                     await self.teams_client.send_incident_notification(
@@ -184,49 +236,55 @@ class WorkflowOrchestrator:
             "components": {},
         }
 
+        teams_enabled = bool(self.teams_client and self.teams_client.is_enabled)
+
+        # Probe all components concurrently; latency is bounded by the slowest one
+        llm_result, sn_result, vs_result, teams_result = await asyncio.gather(
+            self.generator.check_health(),
+            self.servicenow_client.check_health(),
+            asyncio.to_thread(self.retriever.vector_store.count),
+            self.teams_client.check_health() if teams_enabled else asyncio.sleep(0, result=None),
+            return_exceptions=True,
+        )
+
         # Check LLM
-        try:
-            llm_healthy = await self.generator.check_health()
-            health["components"]["llm"] = "healthy" if llm_healthy else "unhealthy"
-        except Exception as e:
-            logger.error(f"LLM health check failed: {e}")
+        if isinstance(llm_result, BaseException):
+            logger.error(f"LLM health check failed: {llm_result}")
             health["components"]["llm"] = "unhealthy"
             health["overall"] = "degraded"
+        else:
+            health["components"]["llm"] = "healthy" if llm_result else "unhealthy"
 
         # Check ServiceNow
-        try:
-            sn_healthy = await self.servicenow_client.check_health()
-            health["components"]["servicenow"] = "healthy" if sn_healthy else "unhealthy"
-        except Exception as e:
-            logger.error(f"ServiceNow health check failed: {e}")
+        if isinstance(sn_result, BaseException):
+            logger.error(f"ServiceNow health check failed: {sn_result}")
             health["components"]["servicenow"] = "unhealthy"
             health["overall"] = "degraded"
+        else:
+            health["components"]["servicenow"] = "healthy" if sn_result else "unhealthy"
 
         # Check Vector Store
-        try:
-            doc_count = self.retriever.vector_store.count()
+        if isinstance(vs_result, BaseException):
+            logger.error(f"Vector store health check failed: {vs_result}")
+            health["components"]["vector_store"] = {"status": "unhealthy"}
+            health["overall"] = "degraded"
+        else:
             health["components"]["vector_store"] = {
                 "status": "healthy",
-                "document_count": doc_count,
+                "document_count": vs_result,
             }
-        except Exception as e:
-            logger.error(f"Vector store health check failed: {e}")
-            health["components"]["vector_store"] = {"status": "unhealthy"}
-            health["overall"] = "degraded"
 
         # Check Teams (if enabled)
-        if self.teams_client and self.teams_client.enabled:
-            try:
-                teams_healthy = await self.teams_client.check_health()
-                health["components"]["teams"] = "healthy" if teams_healthy else "unhealthy"
-                if not teams_healthy:
-                    health["overall"] = "degraded"
-            except Exception as e:
-                logger.error(f"Teams health check failed: {e}")
-                health["components"]["teams"] = "unhealthy"
-                health["overall"] = "degraded"
-        else:
+        if not teams_enabled:
             health["components"]["teams"] = "disabled"
+        elif isinstance(teams_result, BaseException):
+            logger.error(f"Teams health check failed: {teams_result}")
+            health["components"]["teams"] = "unhealthy"
+            health["overall"] = "degraded"
+        else:
+            health["components"]["teams"] = "healthy" if teams_result else "unhealthy"
+            if not teams_result:
+                health["overall"] = "degraded"
 
         logger.info(f"Health check complete: {health['overall']}")
         return health
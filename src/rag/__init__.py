@@ -1,7 +1,7 @@
 """RAG (Retrieval-Augmented Generation) module."""
 
-from .vector_store import VectorStore
+from .vector_store import EmbeddingAccumulator, VectorStore
 from .retriever import Retriever
 from .generator import Generator
 
-__all__ = ["VectorStore", "Retriever", "Generator"]
+__all__ = ["VectorStore", "EmbeddingAccumulator", "Retriever", "Generator"]
@@ -1,9 +1,11 @@
 """LLM generation module using Ollama."""
 
-import json
+import asyncio
+import time
 from typing import Dict, Any, Optional
 
 import httpx
+import orjson
 from loguru import logger
 from tenacity import (
     retry,
@@ -15,9 +17,86 @@ from tenacity import (
 from src.config import Settings
 
 
+class _JsonObjectTracker:
+    """
+    Incrementally detect when the first top-level JSON object in a stream closes.
+
+    Tracking only starts at a ``{`` whose next non-whitespace character is ``"``
+    or ``}``, and a closed candidate is accepted only if it parses as a JSON
+    object, so braces in surrounding prose do not end the stream early.
+    """
+
+    def __init__(self) -> None:
+        self._reset()
+
+    def _reset(self) -> None:
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.pending_open = False
+        self.buffer: list[str] = []
+
+    def _is_valid_object(self) -> bool:
+        try:
+            return isinstance(orjson.loads("".join(self.buffer)), dict)
+        except orjson.JSONDecodeError:
+            return False
+
+    def feed(self, text: str) -> bool:
+        """
+        Consume a chunk of streamed text.
+
+        Args:
+            text: Next chunk of generated text
+
+        Returns:
+            True once the first top-level object has been closed
+        """
+        for char in text:
+            if self.pending_open:
+                if char.isspace():
+                    self.buffer.append(char)
+                    continue
+                self.pending_open = False
+                if char in '"}':
+                    self.depth = 1
+                else:
+                    self.buffer = []
+
+            if self.depth == 0:
+                if char == "{":
+                    self.pending_open = True
+                    self.buffer = [char]
+                continue
+
+            self.buffer.append(char)
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == "{":
+                self.depth += 1
+            elif char == "}":
+                self.depth -= 1
+                if self.depth == 0:
+                    if self._is_valid_object():
+                        return True
+                    self._reset()
+        return False
+
+
 class Generator:
     """LLM-based text generation using Ollama."""
 
+    # Seconds a model-availability answer from /api/tags stays valid
+    HEALTH_CACHE_TTL = 5.0
+
     def __init__(self, settings: Settings):
         """
         Initialize generator with Ollama.
@@ -33,6 +112,24 @@ class Generator:
         self.top_p = settings.llm_top_p
         self.timeout = settings.llm_timeout
 
+        # Constant part of the /api/generate payload, serialized once without its
+        # closing brace so each call only has to encode and splice in the prompt.
+        # The JSON variant asks Ollama to constrain output to valid JSON.
+        payload = {
+            "model": self.model,
+            "stream": True,
+            "options": {
+                "temperature": self.temperature,
+                "num_predict": self.max_tokens,
+                "top_p": self.top_p,
+            },
+        }
+        self._payload_prefix = orjson.dumps(payload)[:-1]
+        self._json_payload_prefix = orjson.dumps({**payload, "format": "json"})[:-1]
+
+        # (timestamp, healthy) of the last /api/tags probe
+        self._health_cache: tuple[float, bool] | None = None
+
         logger.info(f"Initialized Generator with model: {self.model} at {self.base_url}")
 
     @retry(
@@ -40,40 +137,66 @@ class Generator:
         wait=wait_exponential(multiplier=1, min=2, max=10),
         retry=retry_if_exception_type((httpx.HTTPError, httpx.TimeoutException)),
     )
-    async def _call_ollama(self, prompt: str) -> str:
+    async def _call_ollama(self, prompt: str, json_mode: bool = False) -> str:
         """
         Call Ollama API with retry logic.
 
+        The response is streamed. With ``json_mode`` Ollama is asked for JSON
+        output (``format: "json"``) and the stream is closed as soon as the first
+        complete JSON object has been generated, so trailing tokens are never
+        produced. ``llm_timeout`` bounds the whole generation, not just each read.
+
         Args:
             prompt: Prompt text
+            json_mode: Request JSON output and stop once the object is complete
 
         Returns:
             Generated text response
         """
         url = f"{self.base_url}/api/generate"
 
-        payload = {
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False,
-            "options": {
-                "temperature": self.temperature,
-                "num_predict": self.max_tokens,
-                "top_p": self.top_p,
-            },
-        }
+        prefix = self._json_payload_prefix if json_mode else self._payload_prefix
+        body = prefix + b',"prompt":' + orjson.dumps(prompt) + b"}"
 
         logger.debug(f"Calling Ollama API: {url}")
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(url, json=payload)
-            response.raise_for_status()
+        parts = []
+        tracker = _JsonObjectTracker() if json_mode else None
+
+        async with asyncio.timeout(self.timeout), httpx.AsyncClient(timeout=self.timeout) as client:
+            async with client.stream(
+                "POST",
+                url,
+                content=body,
+                headers={"Content-Type": "application/json"},
+            ) as response:
+                response.raise_for_status()
+
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+
+                    chunk = orjson.loads(line)
+                    # Ollama reports mid-stream failures as a 200 with an error line
+                    if "error" in chunk:
+                        raise RuntimeError(f"Ollama generation failed: {chunk['error']}")
+
+                    text = chunk.get("response", "")
+                    parts.append(text)
+
+                    if chunk.get("done"):
+                        break
+                    if tracker is not None and tracker.feed(text):
+                        logger.debug("JSON object complete, closing Ollama stream early")
+                        break
 
-            result = response.json()
-            return result.get("response", "")
+        return "".join(parts)
 
     async def generate(
-        self, prompt: str, system_prompt: Optional[str] = None
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        json_mode: bool = False,
     ) -> str:
         """
         Generate text using Ollama.
@@ -81,6 +204,7 @@ class Generator:
         Args:
             prompt: User prompt
             system_prompt: Optional system prompt
+            json_mode: Request JSON output and stop once the object is complete
 
         Returns:
             Generated text
@@ -94,7 +218,7 @@ class Generator:
 
             logger.info(f"Generating response (prompt length: {len(full_prompt)} chars)")
 
-            response = await self._call_ollama(full_prompt)
+            response = await self._call_ollama(full_prompt, json_mode=json_mode)
 
             logger.info(f"Generated response (length: {len(response)} chars)")
             return response
@@ -166,24 +290,13 @@ Provide a structured incident summary with your best assessment."""
 
         try:
             # Generate response
-            response = await self.generate(user_prompt, system_prompt)
-
-            # Try to parse JSON response
-            try:
-                # Extract JSON from response (in case LLM adds extra text)
-                json_start = response.find("{")
-                json_end = response.rfind("}") + 1
-
-                if json_start >= 0 and json_end > json_start:
-                    json_str = response[json_start:json_end]
-                    incident_data = json.loads(json_str)
-                else:
-                    raise ValueError("No JSON found in response")
+            response = await self.generate(user_prompt, system_prompt, json_mode=True)
 
-            except (json.JSONDecodeError, ValueError) as e:
-                logger.warning(f"Failed to parse JSON from LLM response: {e}")
-                # Fallback: create structured data from raw text
-                incident_data = self._extract_incident_from_text(response, email_content)
+            # JSON mode guarantees a JSON document; anything else falls through to
+            # the minimal fallback below
+            incident_data = orjson.loads(response)
+            if not isinstance(incident_data, dict):
+                raise ValueError("LLM response is not a JSON object")
 
             # Add metadata
             incident_data["has_kb_match"] = has_kb_match
@@ -207,40 +320,29 @@ Provide a structured incident summary with your best assessment."""
                 "error": str(e),
             }
 
-    def _extract_incident_from_text(
-        self, text: str, email_content: str
-    ) -> Dict[str, Any]:
+    async def check_health(self) -> bool:
         """
-        Extract incident data from unstructured text response.
+        Check if Ollama service is healthy and model is available.
 
-        Args:
-            text: LLM response text
-            email_content: Original email content
+        The result is cached for ``HEALTH_CACHE_TTL`` seconds so that frequent
+        liveness/readiness probes do not hit /api/tags on every call.
 
         Returns:
-            Structured incident data
+            True if healthy, False otherwise
         """
-        logger.warning("Using fallback text extraction for incident data")
-
-        # Simple extraction logic
-        lines = text.split("\n")
-
-        short_desc = lines[0][:200] if lines else "Incident from email"
-        description = text[:1000] if len(text) > 200 else email_content[:500]
-
-        return {
-            "short_description": short_desc,
-            "description": description,
-            "category": "Incident",
-            "urgency": 3,
-            "impact": 3,
-            "recommended_actions": [],
-            "kb_references": [],
-        }
+        now = time.monotonic()
+        if self._health_cache is not None:
+            checked_at, healthy = self._health_cache
+            if now - checked_at < self.HEALTH_CACHE_TTL:
+                return healthy
 
-    async def check_health(self) -> bool:
+        healthy = await self._probe_health()
+        self._health_cache = (now, healthy)
+        return healthy
+
+    async def _probe_health(self) -> bool:
         """
-        Check if Ollama service is healthy and model is available.
+        Query Ollama /api/tags and check that the configured model is installed.
 
         Returns:
             True if healthy, False otherwise
@@ -1,7 +1,10 @@
 """Retrieval module for semantic search in vector store."""
 
+import asyncio
+import time
 from typing import List, Dict, Any
 
+import numpy as np
 from loguru import logger
 
 from src.config import Settings
@@ -9,6 +12,173 @@ from src.rag.vector_store import VectorStore
 from src.ingestion.embedder import Embedder
 
 
+class _SemanticCache:
+    """
+    Approximate cache of retrieval results keyed by query embedding.
+
+    Query embeddings are hashed with random-projection LSH into buckets; a hit
+    requires a stored embedding in the same bucket with cosine similarity at
+    or above the threshold. Each bucket keeps its most recently used entries,
+    and entries older than ``ttl`` seconds are never served, so re-ingested
+    knowledge base content is picked up without a restart.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        threshold: float,
+        ttl: float,
+        num_planes: int = 16,
+        bucket_size: int = 10,
+        seed: int = 0,
+    ):
+        """
+        Initialize semantic cache.
+
+        Args:
+            dimension: Embedding dimension
+            threshold: Minimum cosine similarity for a cache hit
+            ttl: Seconds an entry stays valid
+            num_planes: Number of random hyperplanes (signature bits)
+            bucket_size: Maximum entries kept per bucket
+            seed: Seed for the projection matrix
+        """
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal((dimension, num_planes)).astype(np.float32)
+        self.threshold = threshold
+        self.ttl = ttl
+        self.bucket_size = bucket_size
+        self._buckets: Dict[bytes, List[tuple[np.ndarray, Dict[str, Any], float]]] = {}
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray | None:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        # A zero vector has no direction, so it can never be a meaningful match
+        return vector / norm if norm > 0 else None
+
+    def _signature(self, vector: np.ndarray) -> bytes:
+        return np.packbits(vector @ self.planes > 0).tobytes()
+
+    def get(self, embedding: List[float]) -> Dict[str, Any] | None:
+        """Return the cached result for a semantically equivalent query, if any."""
+        vector = self._normalize(embedding)
+        if vector is None:
+            return None
+
+        bucket = self._buckets.get(self._signature(vector))
+        if not bucket:
+            return None
+
+        # Drop expired entries before matching
+        now = time.monotonic()
+        bucket[:] = [entry for entry in bucket if now - entry[2] < self.ttl]
+
+        for idx, (stored, result, _) in enumerate(bucket):
+            if float(stored @ vector) >= self.threshold:
+                # Move to the end so it is evicted last
+                bucket.append(bucket.pop(idx))
+                return result
+
+        return None
+
+    def put(self, embedding: List[float], result: Dict[str, Any]) -> None:
+        """Store a retrieval result for a query embedding."""
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+
+        bucket = self._buckets.setdefault(self._signature(vector), [])
+        bucket.append((vector, result, time.monotonic()))
+        if len(bucket) > self.bucket_size:
+            bucket.pop(0)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._buckets.clear()
+
+
+class _EmbeddingBatcher:
+    """
+    Coalesce concurrent query embeddings into a single batch encoder call.
+
+    Requests arriving within ``window`` seconds of the first pending one are
+    embedded together with ``Embedder.embed_batch`` in a worker thread, so the
+    event loop is never blocked by the model forward pass.
+    """
+
+    def __init__(self, embedder: Embedder, window: float = 0.005):
+        """
+        Initialize embedding batcher.
+
+        Args:
+            embedder: Embedder instance
+            window: Seconds to wait for more requests before flushing
+        """
+        self.embedder = embedder
+        self.window = window
+        self._pending: List[tuple[str, asyncio.Future]] = []
+        self._flush_task: asyncio.Task | None = None
+
+    async def embed(self, text: str) -> np.ndarray:
+        """
+        Embed a single text, batched with any concurrent requests.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Embedding vector (a row of the batch array)
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((text, future))
+
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+            self._flush_task.add_done_callback(self._on_flush_done)
+
+        return await future
+
+    def _take_pending(self) -> List[tuple[str, asyncio.Future]]:
+        """Detach the pending requests so new ones start a fresh batch."""
+        batch, self._pending = self._pending, []
+        self._flush_task = None
+        return batch
+
+    def _on_flush_done(self, task: asyncio.Task) -> None:
+        """Cancel waiters if the flush task was cancelled before it ever ran."""
+        if task.cancelled() and self._flush_task is task:
+            for _, future in self._take_pending():
+                future.cancel()
+
+    async def _flush_after_window(self) -> None:
+        """Wait for the batching window, then embed everything pending."""
+        batch: List[tuple[str, asyncio.Future]] = []
+
+        try:
+            await asyncio.sleep(self.window)
+            batch = self._take_pending()
+            embeddings = await asyncio.to_thread(
+                self.embedder.embed_batch, [text for text, _ in batch]
+            )
+        except asyncio.CancelledError:
+            # Don't leave callers waiting on a flush that will never happen
+            for _, future in batch or self._take_pending():
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        logger.debug(f"Embedded batch of {len(batch)} queries")
+
+        for (_, future), embedding in zip(batch, embeddings):
+            if not future.done():
+                future.set_result(embedding)
+
+
 class Retriever:
     """Semantic search and retrieval from vector store."""
 
@@ -26,17 +196,28 @@ class Retriever:
         self.embedder = embedder
         self.top_k = settings.rag_top_k_results
         self.similarity_threshold = settings.rag_similarity_threshold
+        self.embedding_batcher = _EmbeddingBatcher(embedder)
+
+        self.semantic_cache: _SemanticCache | None = None
+        if settings.rag_semantic_cache_enabled:
+            self.semantic_cache = _SemanticCache(
+                dimension=embedder.get_embedding_dimension(),
+                threshold=settings.rag_semantic_cache_threshold,
+                ttl=settings.rag_semantic_cache_ttl,
+            )
 
         logger.info(
             f"Initialized Retriever with top_k={self.top_k}, "
-            f"threshold={self.similarity_threshold}"
+            f"threshold={self.similarity_threshold}, "
+            f"semantic_cache={self.semantic_cache is not None}"
         )
 
-    def retrieve(
+    async def retrieve(
         self,
         query: str,
         top_k: int | None = None,
         filters: Dict[str, Any] | None = None,
+        query_embedding: List[float] | None = None,
     ) -> List[Dict[str, Any]]:
         """
         Retrieve relevant documents for a query.
@@ -45,6 +226,7 @@ class Retriever:
             query: Search query text
             top_k: Number of results to return (overrides default)
             filters: Optional metadata filters
+            query_embedding: Pre-computed embedding of the query (skips embedding)
 
         Returns:
             List of retrieved documents with metadata and scores
@@ -59,35 +241,56 @@ class Retriever:
 
         try:
             # Generate query embedding
-            query_embedding = self.embedder.embed_text(query)
+            if query_embedding is None:
+                query_embedding = await self.embedding_batcher.embed(query)
 
-            # Query vector store
-            results = self.vector_store.query(
-                query_embeddings=[query_embedding],
-                n_results=n_results,
-                where=filters,
-            )
+            return await self._search(query_embedding, n_results, filters)
 
-            # Process results
-            documents = self._process_results(results)
+        except Exception as e:
+            logger.error(f"Error during retrieval: {e}")
+            raise
 
-            # Filter by similarity threshold
-            filtered_documents = [
-                doc
-                for doc in documents
-                if doc["score"] >= self.similarity_threshold
-            ]
+    async def _search(
+        self,
+        query_embedding: List[float],
+        n_results: int,
+        filters: Dict[str, Any] | None = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Query the vector store with an embedding and apply the similarity threshold.
 
-            logger.info(
-                f"Retrieved {len(filtered_documents)}/{len(documents)} documents "
-                f"above threshold {self.similarity_threshold}"
-            )
+        Args:
+            query_embedding: Query embedding
+            n_results: Number of results to request
+            filters: Optional metadata filters
 
-            return filtered_documents
+        Returns:
+            List of documents above the similarity threshold
+        """
+        # Query vector store (ChromaDB is synchronous, keep it off the event loop)
+        results = await asyncio.to_thread(
+            self.vector_store.query,
+            query_embeddings=[query_embedding],
+            n_results=n_results,
+            where=filters,
+        )
 
-        except Exception as e:
-            logger.error(f"Error during retrieval: {e}")
-            raise
+        # Process results
+        documents = self._process_results(results)
+
+        # Filter by similarity threshold
+        filtered_documents = [
+            doc
+            for doc in documents
+            if doc["score"] >= self.similarity_threshold
+        ]
+
+        logger.info(
+            f"Retrieved {len(filtered_documents)}/{len(documents)} documents "
+            f"above threshold {self.similarity_threshold}"
+        )
+
+        return filtered_documents
 
     def _process_results(self, results: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -106,25 +309,28 @@ class Retriever:
         metadatas = results.get("metadatas", [[]])[0]
         distances = results.get("distances", [[]])[0]
 
-        for idx, doc_id in enumerate(ids):
-            # Convert distance to similarity score (ChromaDB uses cosine distance)
-            # Cosine distance range: [0, 2], similarity: 1 - (distance / 2)
-            distance = distances[idx] if idx < len(distances) else 1.0
-            similarity_score = 1.0 - (distance / 2.0)
+        # Convert distances to similarity scores in one vectorized step (ChromaDB
+        # uses cosine distance). Cosine distance range: [0, 2], similarity:
+        # 1 - (distance / 2). Missing distances count as 1.0.
+        distance_arr = np.ones(len(ids), dtype=np.float64)
+        distance_arr[: len(distances)] = distances[: len(ids)]
+        distance_list = distance_arr.tolist()
+        score_list = (1.0 - distance_arr * 0.5).tolist()
 
+        for idx, doc_id in enumerate(ids):
             document = {
                 "id": doc_id,
                 "content": docs[idx] if idx < len(docs) else "",
                 "metadata": metadatas[idx] if idx < len(metadatas) else {},
-                "score": similarity_score,
-                "distance": distance,
+                "score": score_list[idx],
+                "distance": distance_list[idx],
             }
 
             documents.append(document)
 
         return documents
 
-    def retrieve_with_context(
+    async def retrieve_with_context(
         self,
         query: str,
         max_context_length: int | None = None,
@@ -145,8 +351,27 @@ class Retriever:
             else self.settings.rag_max_context_length
         )
 
+        # Serve semantically equivalent queries from cache (default context length only)
+        use_cache = (
+            self.semantic_cache is not None
+            and max_length == self.settings.rag_max_context_length
+            and bool(query and query.strip())
+        )
+        query_embedding = None
+        if use_cache:
+            query_embedding = await self.embedding_batcher.embed(query)
+            cached = self.semantic_cache.get(query_embedding)
+            if cached is not None:
+                logger.info(f"Semantic cache hit with {cached['num_sources']} sources")
+                # Copy sources so callers can't mutate the cached entry
+                return {
+                    **cached,
+                    "query": query,
+                    "sources": [dict(source) for source in cached["sources"]],
+                }
+
         # Retrieve relevant documents
-        documents = self.retrieve(query)
+        documents = await self.retrieve(query, query_embedding=query_embedding)
 
         if not documents:
             logger.warning("No relevant documents found for query")
@@ -157,25 +382,28 @@ class Retriever:
                 "num_sources": 0,
             }
 
-        # Build context from documents
+        # Build context from documents. Fields are pulled into parallel lists up
+        # front so the assembly loop below is a plain zip without dict lookups.
+        metadatas = [doc["metadata"] for doc in documents]
+        titles = [m.get("title", "Unknown") for m in metadatas]
+        urls = [m.get("url", "") for m in metadatas]
+        chunk_indices = [m.get("chunk_index", 0) for m in metadatas]
+        contents = [doc["content"] for doc in documents]
+        scores = [doc["score"] for doc in documents]
+
         context_parts = []
         sources = []
         current_length = 0
 
-        for doc in documents:
-            content = doc["content"]
-            metadata = doc["metadata"]
-
+        for title, url, chunk_index, content, score in zip(
+            titles, urls, chunk_indices, contents, scores
+        ):
             # Create source reference
-            title = metadata.get("title", "Unknown")
-            url = metadata.get("url", "")
-            chunk_index = metadata.get("chunk_index", 0)
-
             source = {
                 "title": title,
                 "url": url,
                 "chunk_index": chunk_index,
-                "score": doc["score"],
+                "score": score,
             }
 
             # Add to context if within length limit
@@ -196,14 +424,20 @@ class Retriever:
 
         logger.info(f"Built context with {len(sources)} sources ({len(context)} chars)")
 
-        return {
+        result = {
             "query": query,
             "context": context,
             "sources": sources,
             "num_sources": len(sources),
         }
+        if use_cache:
+            self.semantic_cache.put(
+                query_embedding,
+                {**result, "sources": [dict(source) for source in sources]},
+            )
+        return result
 
-    def get_similar_documents(
+    async def get_similar_documents(
         self, document_id: str, top_k: int = 5
     ) -> List[Dict[str, Any]]:
         """
@@ -217,20 +451,18 @@ class Retriever:
             List of similar documents
         """
         try:
-            # Get the document by ID
-            results = self.vector_store.get_by_ids([document_id])
+            # Get the document's stored embedding by ID
+            results = await asyncio.to_thread(
+                self.vector_store.get_by_ids, [document_id], include=["embeddings"]
+            )
 
-            if not results.get("documents"):
+            embeddings = results.get("embeddings")
+            if embeddings is None or len(embeddings) == 0:
                 logger.warning(f"Document {document_id} not found")
                 return []
 
-            # Use the document's embedding to find similar documents
-            # Note: This requires getting the embedding from vector store
-            # For now, we'll use the document text to query
-            document_text = results["documents"][0]
-
-            # Query for similar documents (excluding the original)
-            similar_docs = self.retrieve(document_text, top_k=top_k + 1)
+            # Query with the stored embedding (excluding the original)
+            similar_docs = await self._search(embeddings[0], n_results=top_k + 1)
 
             # Filter out the original document
             similar_docs = [doc for doc in similar_docs if doc["id"] != document_id][:top_k]
@@ -1,18 +1,133 @@
 """Vector store implementation using ChromaDB."""
 
-from typing import List, Dict, Any, Optional
+import asyncio
+import re
+import time
+from typing import Any, ClassVar, Dict, Iterable, List, Optional, Set, Tuple, Union
 from pathlib import Path
 
 import chromadb
+import numpy as np
 from chromadb.config import Settings as ChromaSettings
 from loguru import logger
 
 from src.config import Settings
 
 
+# Metadata value types ChromaDB stores as-is; exact type checks are a set lookup
+_SCALAR_TYPES = frozenset({str, int, float, bool})
+
+
+def _join_sequence(value: Any) -> str:
+    """Convert a list/tuple to a comma-separated string."""
+    return ",".join(map(str, value))
+
+
+# Converters for non-scalar metadata values; anything else falls back to str()
+_CONVERTERS = {tuple: _join_sequence}
+
+# Upper bound on boolean keys generated per list value, to avoid key explosion
+_MAX_LIST_KEYS = 16
+
+_SLUG_PATTERN = re.compile(r"[^a-z0-9]+")
+
+
+def _slug(value: Any) -> str:
+    """Lowercase a value and collapse non-alphanumeric runs to underscores."""
+    return _SLUG_PATTERN.sub("_", str(value).lower()).strip("_")
+
+
+def _expand_list(normalized: Dict[str, Any], key: str, values: List[Any]) -> None:
+    """
+    Store a list as one boolean key per item plus a joined display string.
+
+    ``{"labels": ["Database", "vpn"]}`` becomes ``labels__database=True``,
+    ``labels__vpn=True`` and ``labels_raw="Database,vpn"``, so a label can be
+    matched with ``where={"labels__database": True}`` instead of a document scan.
+    """
+    normalized[f"{key}_raw"] = _join_sequence(values)
+    expanded = 0
+    for item in values:
+        slug = _slug(item)
+        if not slug or f"{key}__{slug}" in normalized:
+            continue
+        if expanded == _MAX_LIST_KEYS:
+            break
+        normalized[f"{key}__{slug}"] = True
+        expanded += 1
+
+
+def _normalize_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert metadata values to types ChromaDB accepts.
+
+    List values are expanded into filterable boolean keys (see ``_expand_list``).
+
+    Args:
+        metadata: Raw metadata dictionary
+
+    Returns:
+        Metadata with only str, int, float and bool values
+    """
+    scalar_types = _SCALAR_TYPES
+    get_converter = _CONVERTERS.get
+    normalized: Dict[str, Any] = {}
+    for key, value in metadata.items():
+        value_type = type(value)
+        if value_type in scalar_types:
+            normalized[key] = value
+        elif value_type is list:
+            _expand_list(normalized, key, value)
+        else:
+            normalized[key] = get_converter(value_type, str)(value)
+    return normalized
+
+
+# Array dtype kinds (bool, int, uint, float, unicode) that tolist() maps straight
+# to ChromaDB metadata types
+_TYPED_COLUMN_KINDS = frozenset("biufU")
+
+# GetResult fields holding one entry per returned ID
+_PER_ID_FIELDS = frozenset({"ids", "embeddings", "documents", "uris", "data", "metadatas"})
+
+
+# Embeddings may be passed as nested lists or as a 2-D array (preferably float32)
+Embeddings = Union[List[List[float]], List[np.ndarray], np.ndarray]
+
+
+def _as_embedding_array(embeddings: Embeddings) -> np.ndarray:
+    """Convert embeddings once to a C-contiguous float32 matrix."""
+    return np.ascontiguousarray(embeddings, dtype=np.float32)
+
+
+def _to_chroma_embeddings(embeddings: Optional[Embeddings]) -> Optional[List[List[float]]]:
+    """
+    Convert embeddings to the nested lists ChromaDB 0.4 validates for.
+
+    Arrays, and lists of array rows, are converted in one vectorized
+    ``tolist()`` call; nested lists pass through unchanged.
+    """
+    if isinstance(embeddings, np.ndarray) or (
+        embeddings and isinstance(embeddings[0], np.ndarray)
+    ):
+        return _as_embedding_array(embeddings).tolist()
+    return embeddings
+
+
 class VectorStore:
     """Vector database operations using ChromaDB."""
 
+    # IDs per get/delete call; stays under SQLite's bound-parameter limit
+    ID_CHUNK_SIZE = 500
+
+    # Seconds a count() result is reused; other processes may write meanwhile
+    COUNT_CACHE_TTL = 5.0
+
+    # Persist directories already created, and one client per directory, shared
+    # across instances so stores on the same path don't contend on SQLite locks
+    _inited_paths: ClassVar[Set[str]] = set()
+    _clients: ClassVar[Dict[str, Any]] = {}
+
     def __init__(self, settings: Settings):
         """
         Initialize ChromaDB vector store.
@@ -23,30 +138,52 @@ class VectorStore:
         self.settings = settings
         self.collection_name = settings.vectordb_collection_name
         self.persist_directory = settings.vectordb_path
-
-        # Ensure persist directory exists
-        Path(self.persist_directory).mkdir(parents=True, exist_ok=True)
+        self.insert_batch_size = settings.vectordb_insert_batch_size
+        # hnswlib is not safe for concurrent writers; async adds are serialized
+        self._write_lock = asyncio.Lock()
+        self._count_cache: tuple[float, int] | None = None
+        self.collection_metadata = {
+            "hnsw:space": "cosine",  # Use cosine similarity
+            "hnsw:M": settings.hnsw_m,
+            "hnsw:construction_ef": settings.hnsw_construction_ef,
+            "hnsw:search_ef": settings.hnsw_search_ef,
+            "hnsw:batch_size": settings.hnsw_batch_size,
+            "hnsw:sync_threshold": settings.hnsw_sync_threshold,
+        }
+
+        # Ensure persist directory exists (once per process)
+        if self.persist_directory not in self._inited_paths:
+            Path(self.persist_directory).mkdir(parents=True, exist_ok=True)
+            self._inited_paths.add(self.persist_directory)
 
         logger.info(f"Initializing ChromaDB at {self.persist_directory}")
 
         # Initialize ChromaDB client
         try:
-            self.client = chromadb.PersistentClient(
-                path=self.persist_directory,
-                settings=ChromaSettings(
-                    anonymized_telemetry=False,
-                    allow_reset=True,
-                ),
-            )
+            self.client = self._clients.get(self.persist_directory)
+            if self.client is None:
+                self.client = chromadb.PersistentClient(
+                    path=self.persist_directory,
+                    settings=ChromaSettings(
+                        anonymized_telemetry=False,
+                        allow_reset=True,
+                    ),
+                )
+                self._clients[self.persist_directory] = self.client
 
             # Get or create collection
             self.collection = self.client.get_or_create_collection(
                 name=self.collection_name,
-                metadata={"hnsw:space": "cosine"},  # Use cosine similarity
+                metadata=self.collection_metadata,
             )
 
             logger.info(f"ChromaDB collection '{self.collection_name}' ready")
-            logger.info(f"Collection contains {self.collection.count()} documents")
+            logger.info(
+                f"HNSW params: M={settings.hnsw_m}, "
+                f"construction_ef={settings.hnsw_construction_ef}, "
+                f"search_ef={settings.hnsw_search_ef}"
+            )
+            logger.info(f"Collection contains {self.count()} documents")
 
         except Exception as e:
             logger.error(f"Failed to initialize ChromaDB: {e}")
@@ -57,7 +194,7 @@ class VectorStore:
         documents: List[str],
         metadatas: List[Dict[str, Any]],
         ids: List[str],
-        embeddings: Optional[List[List[float]]] = None,
+        embeddings: Optional[Embeddings] = None,
     ) -> None:
         """
         Add documents to the vector store.
@@ -66,7 +203,8 @@ class VectorStore:
             documents: List of text documents
             metadatas: List of metadata dictionaries
             ids: List of unique document IDs
-            embeddings: Optional pre-computed embeddings (if None, ChromaDB will compute)
+            embeddings: Optional pre-computed embeddings (if None, ChromaDB will compute);
+                a float32 ``np.ndarray`` of shape (n, dim) avoids per-element conversion
         """
         if not documents:
             logger.warning("No documents to add")
@@ -79,43 +217,189 @@ class VectorStore:
             logger.info(f"Adding {len(documents)} documents to ChromaDB")
 
             # Prepare metadata (ChromaDB requires all values to be strings, ints, or floats)
-            processed_metadatas = []
-            for metadata in metadatas:
-                processed_metadata = {}
-                for key, value in metadata.items():
-                    if isinstance(value, (str, int, float, bool)):
-                        processed_metadata[key] = value
-                    elif isinstance(value, list):
-                        # Convert lists to comma-separated strings
-                        processed_metadata[key] = ",".join(str(v) for v in value)
-                    else:
-                        processed_metadata[key] = str(value)
-                processed_metadatas.append(processed_metadata)
+            processed_metadatas = [_normalize_metadata(metadata) for metadata in metadatas]
 
-            # Add to collection
-            if embeddings:
+            self._write_batches(documents, processed_metadatas, ids, embeddings)
+
+        except Exception as e:
+            logger.error(f"Error adding documents to ChromaDB: {e}")
+            raise
+
+    def add_documents_schema(
+        self,
+        documents: List[str],
+        metadata_columns: Dict[str, Union[np.ndarray, List[Any]]],
+        ids: List[str],
+        embeddings: Optional[Embeddings] = None,
+    ) -> None:
+        """
+        Add documents whose metadata is given column-wise with a fixed schema.
+
+        Intended for large backfills. One-dimensional numeric, bool and string
+        ``np.ndarray`` columns are converted to Python values with one
+        ``tolist()`` per column and need no per-value normalization. If any
+        column is a list or object array, rows are normalized as in
+        add_documents.
+
+        Args:
+            documents: List of text documents
+            metadata_columns: Metadata key -> column of one value per document
+            ids: List of unique document IDs
+            embeddings: Optional pre-computed embeddings
+        """
+        if not documents:
+            logger.warning("No documents to add")
+            return
+
+        if len(documents) != len(ids) or any(
+            len(column) != len(documents) for column in metadata_columns.values()
+        ):
+            raise ValueError("documents, ids, and metadata columns must have same length")
+
+        try:
+            logger.info(f"Adding {len(documents)} documents to ChromaDB from columns")
+
+            keys = list(metadata_columns)
+            columns = [
+                column.tolist() if isinstance(column, np.ndarray) else list(column)
+                for column in metadata_columns.values()
+            ]
+            if columns:
+                metadatas = [dict(zip(keys, row)) for row in zip(*columns)]
+            else:
+                metadatas = [{} for _ in documents]
+
+            typed = all(
+                isinstance(column, np.ndarray)
+                and column.ndim == 1
+                and column.dtype.kind in _TYPED_COLUMN_KINDS
+                for column in metadata_columns.values()
+            )
+            if not typed:
+                metadatas = [_normalize_metadata(metadata) for metadata in metadatas]
+
+            self._write_batches(documents, metadatas, ids, embeddings)
+
+        except Exception as e:
+            logger.error(f"Error adding documents to ChromaDB: {e}")
+            raise
+
+    def _write_batches(
+        self,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        ids: List[str],
+        embeddings: Optional[Embeddings],
+    ) -> None:
+        """Write already-normalized records to the collection in sub-batches."""
+        if isinstance(embeddings, np.ndarray):
+            embeddings = _as_embedding_array(embeddings)
+
+        # Add to collection in sub-batches to amortize Chroma's per-add overhead
+        batch_size = self.insert_batch_size
+        for start in range(0, len(documents), batch_size):
+            end = start + batch_size
+            if embeddings is not None:
                 self.collection.add(
-                    documents=documents,
-                    metadatas=processed_metadatas,
-                    ids=ids,
-                    embeddings=embeddings,
+                    documents=documents[start:end],
+                    metadatas=metadatas[start:end],
+                    ids=ids[start:end],
+                    embeddings=_to_chroma_embeddings(embeddings[start:end]),
                 )
             else:
                 self.collection.add(
-                    documents=documents, metadatas=processed_metadatas, ids=ids
+                    documents=documents[start:end],
+                    metadatas=metadatas[start:end],
+                    ids=ids[start:end],
                 )
 
-            logger.info(f"Successfully added {len(documents)} documents")
-            logger.info(f"Total documents in collection: {self.collection.count()}")
+        self._count_cache = None
 
-        except Exception as e:
-            logger.error(f"Error adding documents to ChromaDB: {e}")
-            raise
+        logger.info(f"Successfully added {len(documents)} documents")
+        logger.opt(lazy=True).debug("Total documents in collection: {}", self.count)
+
+    async def aadd_documents(
+        self,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        ids: List[str],
+        embeddings: Optional[Embeddings] = None,
+    ) -> None:
+        """
+        Add documents without blocking the event loop.
+
+        Runs add_documents in a worker thread. Concurrent calls are
+        serialized so only one write reaches the collection at a time.
+
+        Args:
+            documents: List of text documents
+            metadatas: List of metadata dictionaries
+            ids: List of unique document IDs
+            embeddings: Optional pre-computed embeddings
+        """
+        async with self._write_lock:
+            await asyncio.to_thread(self.add_documents, documents, metadatas, ids, embeddings)
+
+    def add_documents_streaming(
+        self,
+        records: Iterable[Tuple[str, Dict[str, Any], str, Optional[List[float]]]],
+    ) -> int:
+        """
+        Add documents from an iterable without materializing them all at once.
+
+        Records are buffered up to ``insert_batch_size`` and written batch by batch.
+
+        Args:
+            records: Iterable of (document, metadata, id, embedding) tuples;
+                embedding may be None for every record or for none of them
+
+        Returns:
+            Number of documents added
+
+        Raises:
+            ValueError: If some records carry an embedding and others do not
+        """
+        documents: List[str] = []
+        metadatas: List[Dict[str, Any]] = []
+        ids: List[str] = []
+        embeddings: List[List[float]] = []
+        has_embeddings: Optional[bool] = None
+        total = 0
+
+        def flush() -> None:
+            nonlocal total
+            if not documents:
+                return
+            self.add_documents(documents, metadatas, ids, embeddings=embeddings or None)
+            total += len(documents)
+            documents.clear()
+            metadatas.clear()
+            ids.clear()
+            embeddings.clear()
+
+        for document, metadata, doc_id, embedding in records:
+            if has_embeddings is None:
+                has_embeddings = embedding is not None
+            elif has_embeddings != (embedding is not None):
+                raise ValueError(
+                    f"Record {doc_id!r} embedding presence differs from the first record; "
+                    "provide embeddings for every record or for none of them"
+                )
+            documents.append(document)
+            metadatas.append(metadata)
+            ids.append(doc_id)
+            if embedding is not None:
+                embeddings.append(embedding)
+            if len(documents) >= self.insert_batch_size:
+                flush()
+
+        flush()
+        return total
 
     def query(
         self,
         query_texts: Optional[List[str]] = None,
-        query_embeddings: Optional[List[List[float]]] = None,
+        query_embeddings: Optional[Embeddings] = None,
         n_results: int = 5,
         where: Optional[Dict[str, Any]] = None,
         where_document: Optional[Dict[str, Any]] = None,
@@ -125,48 +409,97 @@ class VectorStore:
 
         Args:
             query_texts: Text queries
-            query_embeddings: Pre-computed query embeddings
+            query_embeddings: Pre-computed query embeddings, as lists or an array
             n_results: Number of results to return
-            where: Metadata filter
+            where: Metadata filter; list metadata is matched per item, e.g.
+                ``{"labels__database": True}``
             where_document: Document content filter
 
         Returns:
             Query results containing documents, metadatas, distances, and ids
         """
-        if not query_texts and not query_embeddings:
+        if not query_texts and (query_embeddings is None or len(query_embeddings) == 0):
             raise ValueError("Must provide either query_texts or query_embeddings")
 
         try:
-            logger.debug(f"Querying ChromaDB for {n_results} results")
+            logger.debug("Querying ChromaDB for {} results", n_results)
 
             results = self.collection.query(
                 query_texts=query_texts,
-                query_embeddings=query_embeddings,
+                query_embeddings=_to_chroma_embeddings(query_embeddings),
                 n_results=n_results,
                 where=where,
                 where_document=where_document,
             )
 
-            logger.debug(f"Query returned {len(results.get('ids', [[]])[0])} results")
+            # Lazy: the result count is only computed when DEBUG is enabled
+            first_ids = results.get("ids") or [[]]
+            logger.opt(lazy=True).debug("Query returned {} results", lambda: len(first_ids[0]))
             return results
 
         except Exception as e:
             logger.error(f"Error querying ChromaDB: {e}")
             raise
 
-    def get_by_ids(self, ids: List[str]) -> Dict[str, Any]:
+    async def aquery(
+        self,
+        query_texts: Optional[List[str]] = None,
+        query_embeddings: Optional[Embeddings] = None,
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None,
+        where_document: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Query the vector store in a worker thread.
+
+        Args:
+            query_texts: Text queries
+            query_embeddings: Pre-computed query embeddings, as lists or an array
+            n_results: Number of results to return
+            where: Metadata filter
+            where_document: Document content filter
+
+        Returns:
+            Query results containing documents, metadatas, distances, and ids
+        """
+        return await asyncio.to_thread(
+            self.query,
+            query_texts=query_texts,
+            query_embeddings=query_embeddings,
+            n_results=n_results,
+            where=where,
+            where_document=where_document,
+        )
+
+    def get_by_ids(
+        self, ids: List[str], include: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
         """
         Get documents by their IDs.
 
         Args:
             ids: List of document IDs
+            include: Fields to return (e.g. "embeddings"); ChromaDB defaults
+                to documents and metadatas
 
         Returns:
             Documents and their metadata
         """
         try:
-            results = self.collection.get(ids=ids)
-            return results
+            kwargs = {"include": include} if include is not None else {}
+            if len(ids) <= self.ID_CHUNK_SIZE:
+                return self.collection.get(ids=ids, **kwargs)
+
+            # Keep each SQLite IN clause bounded; merge list fields across chunks
+            merged: Dict[str, Any] = {}
+            for start in range(0, len(ids), self.ID_CHUNK_SIZE):
+                chunk = self.collection.get(ids=ids[start : start + self.ID_CHUNK_SIZE], **kwargs)
+                for key, value in chunk.items():
+                    if key in _PER_ID_FIELDS and value is not None:
+                        merged.setdefault(key, []).extend(value)
+                    else:
+                        merged.setdefault(key, value)
+            return merged
         except Exception as e:
             logger.error(f"Error getting documents by IDs: {e}")
             raise
@@ -179,7 +512,9 @@ class VectorStore:
             ids: List of document IDs to delete
         """
         try:
-            self.collection.delete(ids=ids)
+            for start in range(0, len(ids), self.ID_CHUNK_SIZE):
+                self.collection.delete(ids=ids[start : start + self.ID_CHUNK_SIZE])
+            self._count_cache = None
             logger.info(f"Deleted {len(ids)} documents")
         except Exception as e:
             logger.error(f"Error deleting documents: {e}")
@@ -189,10 +524,21 @@ class VectorStore:
         """
         Get the total number of documents in the collection.
 
+        The result is cached for ``COUNT_CACHE_TTL`` seconds and invalidated
+        by writes through this instance.
+
         Returns:
             Document count
         """
-        return self.collection.count()
+        now = time.monotonic()
+        if self._count_cache is not None:
+            counted_at, count = self._count_cache
+            if now - counted_at < self.COUNT_CACHE_TTL:
+                return count
+
+        count = self.collection.count()
+        self._count_cache = (now, count)
+        return count
 
     def clear(self) -> None:
         """Clear all documents from the collection."""
@@ -201,8 +547,9 @@ class VectorStore:
             self.client.delete_collection(name=self.collection_name)
             self.collection = self.client.create_collection(
                 name=self.collection_name,
-                metadata={"hnsw:space": "cosine"},
+                metadata=self.collection_metadata,
             )
+            self._count_cache = None
             logger.info(f"Cleared collection '{self.collection_name}'")
         except Exception as e:
             logger.error(f"Error clearing collection: {e}")
@@ -215,9 +562,90 @@ class VectorStore:
             # Recreate collection
             self.collection = self.client.get_or_create_collection(
                 name=self.collection_name,
-                metadata={"hnsw:space": "cosine"},
+                metadata=self.collection_metadata,
             )
+            self._count_cache = None
             logger.warning("ChromaDB database has been reset")
         except Exception as e:
             logger.error(f"Error resetting ChromaDB: {e}")
             raise
+
+
+class EmbeddingAccumulator:
+    """
+    Collect documents and embeddings for a bulk add without per-row lists.
+
+    Embeddings are written into one preallocated float32 matrix that doubles
+    in capacity when full; ids, metadatas and documents are kept in parallel
+    lists. ``flush_to`` hands the filled rows to the store as a single array.
+    """
+
+    def __init__(self, dim: int, initial_capacity: int = 4096):
+        """
+        Initialize the accumulator.
+
+        Args:
+            dim: Embedding dimension
+            initial_capacity: Rows to preallocate
+        """
+        self._embeddings = np.empty((max(initial_capacity, 1), dim), dtype=np.float32)
+        self._documents: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._ids: List[str] = []
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(
+        self,
+        embedding: Union[List[float], np.ndarray],
+        doc_id: str,
+        metadata: Dict[str, Any],
+        document: str,
+    ) -> None:
+        """
+        Append one record.
+
+        Args:
+            embedding: Embedding vector of length ``dim``
+            doc_id: Unique document ID
+            metadata: Metadata dictionary
+            document: Document text
+        """
+        if self._size == len(self._embeddings):
+            grown = np.empty(
+                (len(self._embeddings) * 2, self._embeddings.shape[1]), dtype=np.float32
+            )
+            grown[: self._size] = self._embeddings
+            self._embeddings = grown
+
+        self._embeddings[self._size] = embedding
+        self._ids.append(doc_id)
+        self._metadatas.append(metadata)
+        self._documents.append(document)
+        self._size += 1
+
+    def flush_to(self, store: VectorStore) -> int:
+        """
+        Add all accumulated records to a vector store and reset.
+
+        Args:
+            store: Target vector store
+
+        Returns:
+            Number of records flushed
+        """
+        flushed = self._size
+        if flushed:
+            store.add_documents(
+                self._documents,
+                self._metadatas,
+                self._ids,
+                embeddings=self._embeddings[:flushed],
+            )
+        self._documents = []
+        self._metadatas = []
+        self._ids = []
+        self._size = 0
+        return flushed
@@ -1,22 +1,82 @@
 """ServiceNow API client for incident management."""
 
-from typing import Dict, Any, Optional
+import asyncio
+import gzip
+from typing import Dict, Any, List, Optional, Union
 
 import httpx
+import orjson
 from loguru import logger
 from tenacity import (
+    RetryCallState,
     retry,
     stop_after_attempt,
-    wait_exponential,
+    wait_random_exponential,
     retry_if_exception_type,
 )
 
 from src.config import Settings
 
 
+# Table API path for incidents; record paths append "/<sys_id>"
+_INCIDENT_PATH = "/api/now/table/incident"
+
+# Query parameters for the health probe, built once
+_HEALTH_CHECK_PARAMS = {"sysparm_limit": 1}
+
+# Request bodies at least this large are gzip-compressed before sending
+_GZIP_MIN_BYTES = 1024
+_GZIP_HEADERS = {"Content-Encoding": "gzip"}
+
+# Jittered backoff so concurrent callers failing together do not retry in lockstep
+_jittered_wait = wait_random_exponential(multiplier=1, max=10)
+
+# Statuses whose Retry-After header is honored, and the longest delay accepted
+_RETRY_AFTER_STATUSES = frozenset({429, 503})
+_RETRY_AFTER_MAX = 60.0
+
+
+def _wait_respect_retry_after(retry_state: RetryCallState) -> float:
+    """
+    Compute the delay before the next attempt.
+
+    Uses the server's Retry-After header (in seconds) on 429/503 responses,
+    otherwise falls back to jittered exponential backoff.
+
+    Args:
+        retry_state: Current tenacity retry state
+
+    Returns:
+        Seconds to sleep
+    """
+    exception = retry_state.outcome.exception() if retry_state.outcome else None
+    response = getattr(exception, "response", None)
+    if response is not None and response.status_code in _RETRY_AFTER_STATUSES:
+        try:
+            return min(max(float(response.headers["Retry-After"]), 0.0), _RETRY_AFTER_MAX)
+        except (KeyError, ValueError):
+            pass
+    return _jittered_wait(retry_state)
+
+
+def _log_retry(retry_state: RetryCallState) -> None:
+    """Log a failed attempt before tenacity sleeps."""
+    exception = retry_state.outcome.exception() if retry_state.outcome else None
+    logger.warning(
+        f"ServiceNow request failed (attempt {retry_state.attempt_number}), "
+        f"retrying in {retry_state.next_action.sleep:.1f}s: {exception!r}"
+    )
+
+
 class ServiceNowClient:
     """Client for ServiceNow Table API operations."""
 
+    # Maximum parallel page requests per search; more degrades per-call latency
+    SEARCH_CONCURRENCY = 4
+
+    # Default parallel incident creations for bulk submission
+    BULK_CREATE_CONCURRENCY = 4
+
     def __init__(self, settings: Settings):
         """
         Initialize ServiceNow client.
@@ -30,12 +90,36 @@ class ServiceNowClient:
         self.api_version = settings.servicenow_api_version
         self.timeout = 30.0
 
+        # Long-lived client so TCP/TLS connections are reused across requests
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            auth=self.auth,
+            timeout=self.timeout,
+            headers={
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+            },
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+            http2=True,
+        )
+
         logger.info(f"Initialized ServiceNow client for {self.base_url}")
 
+    async def __aenter__(self) -> "ServiceNowClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self._client.aclose()
+
     @retry(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
+        wait=_wait_respect_retry_after,
         retry=retry_if_exception_type((httpx.HTTPError, httpx.TimeoutException)),
+        before_sleep=_log_retry,
     )
     async def _make_request(
         self,
@@ -59,28 +143,28 @@ class ServiceNowClient:
         Raises:
             httpx.HTTPError: If request fails after retries
         """
-        url = f"{self.base_url}{endpoint}"
+        logger.debug("Making {} request to {}{}", method, self.base_url, endpoint)
 
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
+        content = None
+        headers = None
+        if data is not None:
+            # orjson emits bytes directly; large bodies (full email text) are gzipped
+            content = orjson.dumps(data)
+            if len(content) >= _GZIP_MIN_BYTES:
+                content = gzip.compress(content, compresslevel=1)
+                headers = _GZIP_HEADERS
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            logger.debug(f"Making {method} request to {url}")
+        response = await self._client.request(
+            method=method,
+            url=endpoint,
+            content=content,
+            headers=headers,
+            params=params,
+        )
 
-            response = await client.request(
-                method=method,
-                url=url,
-                auth=self.auth,
-                headers=headers,
-                json=data,
-                params=params,
-            )
-
-            response.raise_for_status()
+        response.raise_for_status()
 
-            return response.json()
+        return orjson.loads(response.content)
 
     async def create_incident(self, incident_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -100,7 +184,7 @@ class ServiceNowClient:
         try:
             result = await self._make_request(
                 method="POST",
-                endpoint="/api/now/table/incident",
+                endpoint=_INCIDENT_PATH,
                 data=incident_data,
             )
 
@@ -118,6 +202,40 @@ class ServiceNowClient:
             logger.error(f"Failed to create ServiceNow incident: {e}")
             raise
 
+    async def create_incidents_bulk(
+        self,
+        payloads: List[Dict[str, Any]],
+        concurrency: int = BULK_CREATE_CONCURRENCY,
+    ) -> List[Union[Dict[str, Any], BaseException]]:
+        """
+        Create several incidents concurrently.
+
+        At most ``concurrency`` POSTs are in flight at once over the shared
+        connection pool. One failed incident does not abort the others.
+
+        Args:
+            payloads: Incident details, one dict per incident
+            concurrency: Maximum concurrent create requests
+
+        Returns:
+            Created incident records in payload order; a failed creation is
+            returned as its exception
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def create_one(payload: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.create_incident(payload)
+
+        results = await asyncio.gather(
+            *(create_one(payload) for payload in payloads), return_exceptions=True
+        )
+
+        failed = sum(isinstance(result, BaseException) for result in results)
+        logger.info(f"Bulk created {len(results) - failed}/{len(results)} incidents")
+
+        return results
+
     async def get_incident(self, sys_id: str) -> Dict[str, Any]:
         """
         Get incident by sys_id.
@@ -128,12 +246,12 @@ class ServiceNowClient:
         Returns:
             Incident record
         """
-        logger.debug(f"Fetching incident: {sys_id}")
+        logger.debug("Fetching incident: {}", sys_id)
 
         try:
             result = await self._make_request(
                 method="GET",
-                endpoint=f"/api/now/table/incident/{sys_id}",
+                endpoint=f"{_INCIDENT_PATH}/{sys_id}",
             )
 
             return result.get("result", {})
@@ -160,7 +278,7 @@ class ServiceNowClient:
         try:
             result = await self._make_request(
                 method="PATCH",
-                endpoint=f"/api/now/table/incident/{sys_id}",
+                endpoint=f"{_INCIDENT_PATH}/{sys_id}",
                 data=update_data,
             )
 
@@ -171,31 +289,45 @@ class ServiceNowClient:
             raise
 
     async def search_incidents(
-        self, query: str, limit: int = 100
+        self, query: str, limit: int = 100, page_size: int = 200
     ) -> list[Dict[str, Any]]:
         """
         Search incidents using query.
 
+        Results beyond ``page_size`` are fetched as offset pages in parallel,
+        with at most ``SEARCH_CONCURRENCY`` requests in flight.
+
         Args:
             query: Search query
             limit: Maximum number of results
+            page_size: Records requested per page
 
         Returns:
             List of matching incidents
         """
-        logger.debug(f"Searching incidents with query: {query}")
+        logger.debug("Searching incidents with query: {}", query)
+
+        semaphore = asyncio.Semaphore(self.SEARCH_CONCURRENCY)
+
+        async def fetch_page(offset: int) -> list[Dict[str, Any]]:
+            async with semaphore:
+                result = await self._make_request(
+                    method="GET",
+                    endpoint=_INCIDENT_PATH,
+                    params={
+                        "sysparm_query": query,
+                        "sysparm_limit": min(page_size, limit - offset),
+                        "sysparm_offset": offset,
+                    },
+                )
+            return result.get("result", [])
 
         try:
-            result = await self._make_request(
-                method="GET",
-                endpoint="/api/now/table/incident",
-                params={
-                    "sysparm_query": query,
-                    "sysparm_limit": limit,
-                },
+            pages = await asyncio.gather(
+                *(fetch_page(offset) for offset in range(0, limit, page_size))
             )
 
-            incidents = result.get("result", [])
+            incidents = [incident for page in pages for incident in page]
             logger.info(f"Found {len(incidents)} incidents matching query")
 
             return incidents
@@ -215,8 +347,8 @@ class ServiceNowClient:
             # Try to get a single incident (just to check connectivity)
             await self._make_request(
                 method="GET",
-                endpoint="/api/now/table/incident",
-                params={"sysparm_limit": 1},
+                endpoint=_INCIDENT_PATH,
+                params=_HEALTH_CHECK_PARAMS,
             )
 
             logger.info("ServiceNow API is healthy")
@@ -1,16 +1,72 @@
 """Incident data builder for ServiceNow."""
 
-from typing import Dict, Any
-from datetime import datetime
+from typing import Dict, Any, Optional
+from datetime import datetime, timezone
 
+import numpy as np
 from loguru import logger
 
 from src.config import Settings
 
 
+def _format_timestamp(timestamp: Optional[datetime] = None) -> str:
+    """
+    Format a timestamp as second-precision ISO 8601 UTC with a trailing Z.
+
+    Args:
+        timestamp: Time to format (defaults to now); naive values are taken as UTC
+
+    Returns:
+        Timestamp string such as ``2024-01-01T12:00:00Z``
+    """
+    if timestamp is None:
+        timestamp = datetime.now(timezone.utc)
+    elif timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc)
+    return timestamp.replace(tzinfo=None).isoformat(timespec="seconds") + "Z"
+
+
+# ServiceNow rejects short descriptions longer than 160 bytes
+_SHORT_DESCRIPTION_MAX_BYTES = 160
+
+
+def _fit_short_description(text: Optional[str], fallback: str) -> str:
+    """
+    Normalize a short description for ServiceNow in one pass.
+
+    Collapses all whitespace (including newlines) to single spaces, then
+    truncates to 160 UTF-8 bytes without splitting a multi-byte character.
+
+    Args:
+        text: Candidate short description
+        fallback: Value used when text is empty after normalization
+
+    Returns:
+        Short description that fits the ServiceNow limit
+    """
+    collapsed = " ".join((text or "").split())
+    encoded = collapsed.encode("utf-8")
+    if len(encoded) > _SHORT_DESCRIPTION_MAX_BYTES:
+        collapsed = (
+            encoded[:_SHORT_DESCRIPTION_MAX_BYTES].decode("utf-8", "ignore").rstrip()
+        )
+    return collapsed or fallback
+
+
 class IncidentBuilder:
     """Build ServiceNow incident payloads."""
 
+    # Priority indexed by [urgency - 1][impact - 1], precomputed from the
+    # average-of-urgency-and-impact thresholds documented in _calculate_priority
+    _PRIORITY_TABLE = (
+        (1, 1, 1, 2, 3),
+        (1, 1, 2, 3, 3),
+        (1, 2, 3, 3, 4),
+        (2, 3, 3, 4, 4),
+        (3, 3, 4, 4, 5),
+    )
+    _PRIORITY_TABLE_NP = np.array(_PRIORITY_TABLE, dtype=np.int8)
+
     def __init__(self, settings: Settings):
         """
         Initialize incident builder.
@@ -24,6 +80,19 @@ class IncidentBuilder:
         self.default_urgency = settings.servicenow_urgency
         self.default_impact = settings.servicenow_impact
 
+        # Payload prototype with static fields filled in; builders copy and overwrite
+        self._incident_template: Dict[str, Any] = {
+            "short_description": "",
+            "description": "",
+            "assignment_group": self.default_assignment_group,
+            "category": self.default_category,
+            "urgency": self.default_urgency,
+            "impact": self.default_impact,
+            "priority": 3,
+            "caller_id": "",
+            "contact_type": "email",
+        }
+
         logger.info("Initialized IncidentBuilder")
 
     def build_from_llm_output(
@@ -46,34 +115,39 @@ class IncidentBuilder:
         logger.info("Building incident from LLM output")
 
         # Extract data from LLM output with fallbacks
-        short_description = llm_output.get(
-            "short_description",
-            email_subject or "Incident from automated email processing",
+        short_description = _fit_short_description(
+            llm_output.get("short_description") or email_subject,
+            "Incident from automated email processing",
         )
 
         description = llm_output.get("description", "")
 
-        # Add metadata to description
-        metadata_parts = [
+        # Append metadata to description; all lines are joined once at the end
+        sections = [
+            description,
+            "",
+            "---",
+            "",
             f"Original Email From: {email_from}",
             f"Email Subject: {email_subject}",
-            f"Processed At: {datetime.utcnow().isoformat()}Z",
+            f"Processed At: {_format_timestamp()}",
         ]
 
         # Add KB references if available
         kb_references = llm_output.get("kb_references", [])
         if kb_references:
-            kb_text = "\n".join(f"- {ref}" for ref in kb_references)
-            metadata_parts.append(f"\nKnowledge Base References:\n{kb_text}")
+            sections.append("")
+            sections.append("Knowledge Base References:")
+            sections.extend([f"- {ref}" for ref in kb_references])
 
         # Add recommended actions if available
         recommended_actions = llm_output.get("recommended_actions", [])
         if recommended_actions:
-            actions_text = "\n".join(f"- {action}" for action in recommended_actions)
-            metadata_parts.append(f"\nRecommended Actions:\n{actions_text}")
+            sections.append("")
+            sections.append("Recommended Actions:")
+            sections.extend([f"- {action}" for action in recommended_actions])
 
-        # Combine description with metadata
-        full_description = f"{description}\n\n---\n\n" + "\n".join(metadata_parts)
+        full_description = "\n".join(sections)
 
         # Get urgency and impact with validation
         urgency = self._validate_priority_value(
@@ -83,21 +157,16 @@ class IncidentBuilder:
             llm_output.get("impact", self.default_impact)
         )
 
-        # Calculate priority
-        priority = self._calculate_priority(urgency, impact)
-
-        # Build incident payload
-        incident_data = {
-            "short_description": short_description[:160],  # ServiceNow has 160 char limit
-            "description": full_description,
-            "assignment_group": self.default_assignment_group,
-            "category": llm_output.get("category", self.default_category),
-            "urgency": urgency,
-            "impact": impact,
-            "priority": priority,
-            "caller_id": email_from,
-            "contact_type": "email",
-        }
+        # Build incident payload from the template
+        incident_data = self._incident_template.copy()
+        incident_data["short_description"] = short_description
+        incident_data["description"] = full_description
+        incident_data["urgency"] = urgency
+        incident_data["impact"] = impact
+        incident_data["priority"] = self._calculate_priority(urgency, impact)
+        incident_data["caller_id"] = email_from
+        if "category" in llm_output:
+            incident_data["category"] = llm_output["category"]
 
         logger.debug(f"Built incident payload: {incident_data['short_description']}")
         return incident_data
@@ -125,11 +194,11 @@ class IncidentBuilder:
         """
         logger.info("Building incident directly from email")
 
-        short_description = email_subject[:160] or "Incident from email"
+        short_description = _fit_short_description(email_subject, "Incident from email")
 
         description = f"""Email Subject: {email_subject}
 Email From: {email_from}
-Received: {datetime.utcnow().isoformat()}Z
+Received: {_format_timestamp()}
 
 Email Content:
 {email_body}
@@ -141,17 +210,13 @@ No matching knowledge base articles were found during automated processing."""
         urgency_val = self._validate_priority_value(urgency or self.default_urgency)
         impact_val = self._validate_priority_value(impact or self.default_impact)
 
-        incident_data = {
-            "short_description": short_description,
-            "description": description,
-            "assignment_group": self.default_assignment_group,
-            "category": self.default_category,
-            "urgency": urgency_val,
-            "impact": impact_val,
-            "priority": self._calculate_priority(urgency_val, impact_val),
-            "caller_id": email_from,
-            "contact_type": "email",
-        }
+        incident_data = self._incident_template.copy()
+        incident_data["short_description"] = short_description
+        incident_data["description"] = description
+        incident_data["urgency"] = urgency_val
+        incident_data["impact"] = impact_val
+        incident_data["priority"] = self._calculate_priority(urgency_val, impact_val)
+        incident_data["caller_id"] = email_from
 
         return incident_data
 
@@ -180,7 +245,8 @@ No matching knowledge base articles were found during automated processing."""
         """
         Calculate priority based on urgency and impact.
 
-        ServiceNow priority matrix:
+        ServiceNow priority matrix, looked up from the average of urgency and
+        impact (<=2 Critical, <=2.5 High, <=3.5 Moderate, <=4.5 Low, else Planning):
         - Critical (1): Urgency 1-2, Impact 1-2
         - High (2): Urgency 1-3, Impact 1-3
         - Moderate (3): Urgency 2-4, Impact 2-4
@@ -193,46 +259,67 @@ No matching knowledge base articles were found during automated processing."""
 
         Returns:
             Priority level (1-5)
+
+        Raises:
+            ValueError: If urgency or impact is outside 1-5
         """
-        avg = (urgency + impact) / 2
+        # Guard before indexing: 0 or negatives would wrap to the end of the table
+        if not (1 <= urgency <= 5 and 1 <= impact <= 5):
+            raise ValueError(f"Urgency and impact must be 1-5, got {urgency} and {impact}")
+        return self._PRIORITY_TABLE[urgency - 1][impact - 1]
 
-        if avg <= 2:
-            return 1  # Critical
-        elif avg <= 2.5:
-            return 2  # High
-        elif avg <= 3.5:
-            return 3  # Moderate
-        elif avg <= 4.5:
-            return 4  # Low
-        else:
-            return 5  # Planning
+    def _calculate_priority_vec(self, urgencies: np.ndarray, impacts: np.ndarray) -> np.ndarray:
+        """
+        Calculate priorities for many urgency/impact pairs at once.
+
+        Args:
+            urgencies: Array of urgency levels (1-5)
+            impacts: Array of impact levels (1-5), same shape as urgencies
+
+        Returns:
+            Array of priority levels (1-5)
 
-    def add_work_note(self, note: str) -> Dict[str, Any]:
+        Raises:
+            ValueError: If any urgency or impact is outside 1-5
+        """
+        urgencies = np.asarray(urgencies)
+        impacts = np.asarray(impacts)
+        if ((urgencies < 1) | (urgencies > 5) | (impacts < 1) | (impacts > 5)).any():
+            raise ValueError("Urgency and impact must be 1-5")
+        return self._PRIORITY_TABLE_NP[urgencies - 1, impacts - 1]
+
+    def add_work_note(
+        self, note: str, timestamp: Optional[datetime] = None
+    ) -> Dict[str, Any]:
         """
         Format a work note for adding to an incident.
 
         Args:
             note: Work note content
+            timestamp: Optional time to stamp the work note with; pass one shared
+                value when formatting many work notes at once
 
         Returns:
             Update payload with work note
         """
-        timestamp = datetime.utcnow().isoformat() + "Z"
-        formatted_note = f"[{timestamp}] {note}"
+        formatted_note = f"[{_format_timestamp(timestamp)}] {note}"
 
         return {"work_notes": formatted_note}
 
-    def add_comment(self, comment: str) -> Dict[str, Any]:
+    def add_comment(
+        self, comment: str, timestamp: Optional[datetime] = None
+    ) -> Dict[str, Any]:
         """
         Format a comment for adding to an incident.
 
         Args:
             comment: Comment content
+            timestamp: Optional time to stamp the comment with; pass one shared
+                value when formatting many comments at once
 
         Returns:
             Update payload with comment
         """
-        timestamp = datetime.utcnow().isoformat() + "Z"
-        formatted_comment = f"[{timestamp}] {comment}"
+        formatted_comment = f"[{_format_timestamp(timestamp)}] {comment}"
 
         return {"comments": formatted_comment}
@@ -1,21 +1,97 @@
 """Microsoft Teams client for sending incident notifications."""
 
-from typing import Dict, Any, List, Optional
+import asyncio
+import itertools
+from typing import Dict, Any, List, Optional, Tuple
+
 import httpx
+import orjson
 from tenacity import (
-    retry,
+    AsyncRetrying,
+    RetryCallState,
     stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
+    wait_exponential_jitter,
+    retry_if_exception,
 )
 from loguru import logger
 
 from src.config import Settings
 
 
+# Statuses worth retrying; other 4xx responses are permanent and fail at once
+_TRANSIENT_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# Longest server-requested Retry-After delay honored, in seconds
+_RETRY_AFTER_MAX = 60.0
+
+_jittered_wait = wait_exponential_jitter(initial=1, max=30, jitter=0.5)
+
+
+# Static parts of the Adaptive Card envelope, shared by every card (never mutated)
+_CARD_CONTENT_TEMPLATE: Dict[str, Any] = {
+    "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
+    "type": "AdaptiveCard",
+    "version": "1.4",
+    "body": [],
+    "msteams": {"width": "Full"},
+}
+_CARD_ATTACHMENT_TEMPLATE: Dict[str, Any] = {
+    "contentType": "application/vnd.microsoft.card.adaptive",
+    "contentUrl": None,
+}
+
+
+# Title colors by incident priority; anything else renders "Default" (gray)
+_PRIORITY_COLORS = {
+    1: "Attention",  # Red
+    2: "Warning",  # Orange
+    3: "Accent",  # Blue
+}
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Minimal message posted by the health check, serialized once
+_HEALTH_CHECK_BODY = orjson.dumps(
+    {"type": "message", "text": "Health check from RAG Incident System"}
+)
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Return True for network errors and retryable HTTP statuses."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _TRANSIENT_STATUSES
+    return isinstance(exc, httpx.RequestError)
+
+
+def _wait_respect_retry_after(retry_state: RetryCallState) -> float:
+    """
+    Compute the delay before the next attempt.
+
+    Uses the response's Retry-After header (in seconds) when present,
+    otherwise jittered exponential backoff.
+
+    Args:
+        retry_state: Current tenacity retry state
+
+    Returns:
+        Seconds to sleep
+    """
+    exception = retry_state.outcome.exception() if retry_state.outcome else None
+    if isinstance(exception, httpx.HTTPStatusError):
+        try:
+            retry_after = float(exception.response.headers["Retry-After"])
+            return min(max(retry_after, 0.0), _RETRY_AFTER_MAX)
+        except (KeyError, ValueError):
+            pass
+    return _jittered_wait(retry_state)
+
+
 class TeamsClient:
     """Microsoft Teams webhook client."""
 
+    # Maximum concurrent webhook POSTs for bulk sends; keeps under Teams throttling
+    BULK_CONCURRENCY = 10
+
     def __init__(self, settings: Settings):
         """
         Initialize Teams client.
@@ -35,11 +111,50 @@ class TeamsClient:
         else:
             logger.info("Microsoft Teams client initialized")
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, max=10),
-        retry=retry_if_exception_type((httpx.RequestError, httpx.HTTPStatusError)),
-    )
+        # Shared connection pool, created in startup() and reused for every POST
+        self._client: Optional[httpx.AsyncClient] = None
+        self._protocol_logged = False
+
+        # Retry policy built once; each send iterates a copy so concurrent
+        # notifications never share attempt state
+        self._retrying = AsyncRetrying(
+            stop=stop_after_attempt(3),
+            wait=_wait_respect_retry_after,
+            retry=retry_if_exception(_is_transient),
+            reraise=True,
+        )
+
+    @property
+    def is_enabled(self) -> bool:
+        """Whether notifications will be sent; check before building any card."""
+        return self.enabled
+
+    async def startup(self) -> None:
+        """Create the pooled HTTP client used for webhook calls."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(connect=5.0, read=30.0, write=10.0, pool=5.0),
+                limits=httpx.Limits(
+                    max_keepalive_connections=10,
+                    max_connections=20,
+                    keepalive_expiry=30.0,
+                ),
+                # Multiplex burst notifications over one TLS connection
+                http2=True,
+            )
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Return the pooled HTTP client, creating it if startup() was not called."""
+        if self._client is None:
+            await self.startup()
+        return self._client
+
     async def send_incident_notification(
         self,
         incident_data: Dict[str, Any],
@@ -65,30 +180,83 @@ class TeamsClient:
             # Build Adaptive Card
             card = self._build_adaptive_card(incident_data, llm_summary, kb_sources)
 
-            # Send to Teams
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    self.webhook_url,
-                    json=card,
-                    headers={"Content-Type": "application/json"},
-                )
-                response.raise_for_status()
+            # Serialize once with orjson; retries resend the same bytes
+            body = orjson.dumps(card)
+
+            # Send to Teams over the pooled client, retrying transient failures
+            client = await self._get_client()
+            async for attempt in self._retrying.copy():
+                with attempt:
+                    response = await client.post(
+                        self.webhook_url,
+                        content=body,
+                        headers=_JSON_HEADERS,
+                    )
+                    response.raise_for_status()
+
+            if not self._protocol_logged:
+                logger.info("Teams webhook negotiated {}", response.http_version)
+                self._protocol_logged = True
 
             logger.info(
-                f"Successfully sent Teams notification for incident {incident_data.get('number', 'Unknown')}"
+                "Successfully sent Teams notification for incident {}",
+                incident_data.get("number", "Unknown"),
             )
             return True
 
         except httpx.HTTPStatusError as e:
-            logger.error(f"Teams API error: {e.response.status_code} - {e.response.text}")
+            # Lazy so the response body is only read when the record is emitted
+            logger.opt(lazy=True).error(
+                "Teams API error: {} - {}",
+                lambda: e.response.status_code,
+                lambda: e.response.text,
+            )
             raise
         except httpx.RequestError as e:
-            logger.error(f"Teams request error: {e}")
+            logger.error("Teams request error: {}", e)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error sending Teams notification: {e}")
+            logger.error("Unexpected error sending Teams notification: {}", e)
             return False
 
+    async def send_incident_notifications_bulk(
+        self,
+        items: List[
+            Tuple[
+                Dict[str, Any],
+                Optional[Dict[str, Any]],
+                Optional[List[Dict[str, Any]]],
+            ]
+        ],
+    ) -> List[bool]:
+        """
+        Send several incident notifications concurrently.
+
+        Incoming webhooks accept one card per POST, so the cards are sent in
+        parallel over the pooled client, at most ``BULK_CONCURRENCY`` at a time.
+
+        Args:
+            items: (incident_data, llm_summary, kb_sources) tuples
+
+        Returns:
+            Per-item success flags, in input order
+        """
+        if not self.enabled:
+            logger.debug("Teams notifications disabled, skipping")
+            return [False] * len(items)
+
+        semaphore = asyncio.Semaphore(self.BULK_CONCURRENCY)
+
+        async def send_one(item) -> bool:
+            async with semaphore:
+                return await self.send_incident_notification(*item)
+
+        results = await asyncio.gather(*(send_one(item) for item in items), return_exceptions=True)
+
+        sent = [result is True for result in results]
+        logger.info("Sent {}/{} Teams notifications", sum(sent), len(items))
+        return sent
+
     def _build_adaptive_card(
         self,
         incident_data: Dict[str, Any],
@@ -157,84 +325,77 @@ class TeamsClient:
             kb_references = llm_summary.get("kb_references", [])
 
             if description:
-                card_body.append({
-                    "type": "TextBlock",
-                    "text": "**Analysis:**",
-                    "weight": "Bolder",
-                    "spacing": "Medium",
-                })
-                card_body.append({
-                    "type": "TextBlock",
-                    "text": description,
-                    "wrap": True,
-                    "isSubtle": True,
-                })
+                card_body.extend((
+                    {
+                        "type": "TextBlock",
+                        "text": "**Analysis:**",
+                        "weight": "Bolder",
+                        "spacing": "Medium",
+                    },
+                    {
+                        "type": "TextBlock",
+                        "text": description,
+                        "wrap": True,
+                        "isSubtle": True,
+                    },
+                ))
 
             if recommended_actions:
-                card_body.append({
-                    "type": "TextBlock",
-                    "text": "**Recommended Actions:**",
-                    "weight": "Bolder",
-                    "spacing": "Medium",
-                })
-                actions_text = "\n".join([f"• {action}" for action in recommended_actions])
-                card_body.append({
-                    "type": "TextBlock",
-                    "text": actions_text,
-                    "wrap": True,
-                })
+                card_body.extend((
+                    {
+                        "type": "TextBlock",
+                        "text": "**Recommended Actions:**",
+                        "weight": "Bolder",
+                        "spacing": "Medium",
+                    },
+                    {
+                        "type": "TextBlock",
+                        "text": "\n".join(f"• {action}" for action in recommended_actions),
+                        "wrap": True,
+                    },
+                ))
 
             if kb_references:
-                card_body.append({
-                    "type": "TextBlock",
-                    "text": "**Knowledge Base References:**",
-                    "weight": "Bolder",
-                    "spacing": "Medium",
-                })
-                kb_text = "\n".join([f"• {ref}" for ref in kb_references])
-                card_body.append({
-                    "type": "TextBlock",
-                    "text": kb_text,
-                    "wrap": True,
-                    "isSubtle": True,
-                })
+                card_body.extend((
+                    {
+                        "type": "TextBlock",
+                        "text": "**Knowledge Base References:**",
+                        "weight": "Bolder",
+                        "spacing": "Medium",
+                    },
+                    {
+                        "type": "TextBlock",
+                        "text": "\n".join(f"• {ref}" for ref in kb_references),
+                        "wrap": True,
+                        "isSubtle": True,
+                    },
+                ))
 
         # Add KB sources if available
-        if kb_sources and len(kb_sources) > 0:
+        if kb_sources:
             card_body.append({
                 "type": "TextBlock",
                 "text": f"{len(kb_sources)} relevant KB articles found",
                 "weight": "Bolder",
                 "spacing": "Medium",
             })
-            for source in kb_sources[:3]:  # Show top 3 sources
-                score = source.get("score", 0)
-                url = source.get("url", "")
-                card_body.append({
+            # Show top 3 sources without copying the list
+            card_body.extend(
+                {
                     "type": "TextBlock",
-                    "text": f"• [{url}]({url}) (Score: {score:.2f})",
+                    "text": f"• [{source.get('url', '')}]({source.get('url', '')}) "
+                    f"(Score: {source.get('score', 0):.2f})",
                     "wrap": True,
                     "isSubtle": True,
-                })
+                }
+                for source in itertools.islice(kb_sources, 3)
+            )
 
-        # Build complete Adaptive Card
+        # Build complete Adaptive Card from the static envelope templates
+        content = {**_CARD_CONTENT_TEMPLATE, "body": card_body}
         adaptive_card = {
             "type": "message",
-            "attachments": [
-                {
-                    "contentType": "application/vnd.microsoft.card.adaptive",
-                    "contentUrl": None,
-                    "content": {
-                        "$schema": "http://adaptivecards.io/schemas/adaptive-card.json",
-                        "type": "AdaptiveCard",
-                        "version": "1.4",
-                        "body": card_body,
-                        "msteams": {
-                            "width": "Full"
-                        }
-                    }
-                }
-            ]
+            "attachments": [{**_CARD_ATTACHMENT_TEMPLATE, "content": content}],
         }
 
         return adaptive_card
@@ -249,14 +410,7 @@ class TeamsClient:
         Returns:
             Color name for Adaptive Card
         """
-        if priority == 1:
-            return "Attention"  # Red
-        elif priority == 2:
-            return "Warning"    # Orange
-        elif priority == 3:
-            return "Accent"     # Blue
-        else:
-            return "Default"    # Gray
+        return _PRIORITY_COLORS.get(priority, "Default")
 
     async def check_health(self) -> bool:
         """
@@ -270,22 +424,18 @@ class TeamsClient:
 
         try:
             # Test webhook with minimal payload
-            test_card = {
-                "type": "message",
-                "text": "Health check from RAG Incident System"
-            }
-
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    self.webhook_url,
-                    json=test_card,
-                    headers={"Content-Type": "application/json"},
-                )
-                response.raise_for_status()
+            client = await self._get_client()
+            response = await client.post(
+                self.webhook_url,
+                content=_HEALTH_CHECK_BODY,
+                headers=_JSON_HEADERS,
+                timeout=10.0,
+            )
+            response.raise_for_status()
 
             logger.debug("Teams webhook health check passed")
             return True
 
         except Exception as e:
-            logger.error(f"Teams webhook health check failed: {e}")
+            logger.error("Teams webhook health check failed: {}", e)
             return False
@@ -1,8 +1,11 @@
 """Pytest configuration and fixtures."""
 
 import asyncio
+import httpx
 import pytest
-from typing import AsyncGenerator, Generator
+from types import MappingProxyType
+from typing import Callable, Generator, Mapping, Tuple
+from unittest.mock import patch
 
 import sys
 from pathlib import Path
@@ -13,14 +16,6 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.config import Settings, get_settings
 
 
-@pytest.fixture(scope="session")
-def event_loop() -> Generator:
-    """Create an instance of the default event loop for each test case."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
-
-
 @pytest.fixture(scope="session")
 def settings() -> Settings:
     """Get application settings."""
@@ -28,9 +23,60 @@ def settings() -> Settings:
 
 
 @pytest.fixture
-def sample_email_data() -> dict:
+def mock_http_transport() -> Callable:
+    """
+    Factory routing every httpx.AsyncClient a module creates through a mock handler.
+
+    Usage: ``with mock_http_transport("src.teams.client", handler) as client_cls:``
+    """
+
+    def factory(module: str, handler: Callable[[httpx.Request], httpx.Response]):
+        real_client = httpx.AsyncClient
+
+        def client_factory(*args, **kwargs):
+            kwargs["transport"] = httpx.MockTransport(handler)
+            return real_client(*args, **kwargs)
+
+        return patch(f"{module}.httpx.AsyncClient", side_effect=client_factory)
+
+    return factory
+
+
+@pytest.fixture(scope="session")
+def embedder(settings: Settings):
+    """Embedder shared by the session so the model is loaded only once."""
+    from src.ingestion.embedder import Embedder
+
+    return Embedder(settings)
+
+
+@pytest.fixture(scope="session")
+def processor(settings: Settings):
+    """DocumentProcessor shared by the session."""
+    from src.ingestion.document_processor import DocumentProcessor
+
+    return DocumentProcessor(settings)
+
+
+@pytest.fixture(scope="session")
+def async_client() -> Generator[httpx.AsyncClient, None, None]:
+    """
+    In-process async HTTP client for the FastAPI app, shared by the session.
+
+    Built synchronously so it is not tied to any test's event loop; the ASGI
+    transport holds no loop-bound connections.
+    """
+    from src.main import app
+
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+    yield client
+    asyncio.run(client.aclose())
+
+
+@pytest.fixture(scope="session")
+def sample_email_data() -> Mapping:
     """Sample email data for testing."""
-    return {
+    return MappingProxyType({
         "from": "xyz@test.com",
         "subject": "Database connection timeout issues",
         "body": """We are experiencing severe database connection timeout issues.
@@ -43,14 +89,14 @@ Symptoms:
 
 This is affecting multiple services and causing user complaints.
 """,
-    }
+    })
 
 
-@pytest.fixture
-def sample_confluence_docs() -> list:
+@pytest.fixture(scope="session")
+def sample_confluence_docs() -> Tuple[Mapping, ...]:
     """Sample Confluence documents for testing."""
-    return [
-        {
+    return (
+        MappingProxyType({
             "id": "page_001",
             "title": "Database Connection Troubleshooting",
             "content": """
@@ -72,8 +118,8 @@ Connection timeouts often occur due to:
             "space": "TECH",
             "url": "https://confluence.example.com/display/TECH/db-troubleshooting",
             "labels": ["database", "troubleshooting"],
-        },
-        {
+        }),
+        MappingProxyType({
             "id": "page_002",
             "title": "Connection Pool Best Practices",
             "content": """
@@ -94,14 +140,14 @@ Monitor these key metrics:
             "space": "TECH",
             "url": "https://confluence.example.com/display/TECH/connection-pools",
             "labels": ["database", "best-practices"],
-        },
-    ]
+        }),
+    )
 
 
-@pytest.fixture
-def sample_llm_output() -> dict:
+@pytest.fixture(scope="session")
+def sample_llm_output() -> Mapping:
     """Sample LLM output for testing."""
-    return {
+    return MappingProxyType({
         "summary": "Database connection timeout issue affecting multiple services",
         "description": "Experiencing database connection timeouts causing HTTP 504 errors during peak hours",
         "priority": "2",
@@ -114,13 +160,13 @@ def sample_llm_output() -> dict:
 3. Implement connection retry logic
 4. Review connection timeout settings
 """,
-    }
+    })
 
 
-@pytest.fixture
-def sample_incident_data() -> dict:
+@pytest.fixture(scope="session")
+def sample_incident_data() -> Mapping:
     """Sample ServiceNow incident data for testing."""
-    return {
+    return MappingProxyType({
         "short_description": "Database connection timeout issues",
         "description": "Experiencing database connection timeouts causing HTTP 504 errors",
         "urgency": "2",
@@ -130,4 +176,4 @@ def sample_incident_data() -> dict:
         "caller_id": "xyz@test.com",
         "assignment_group": "IT Support",
         "work_notes": "Knowledge base articles consulted for resolution",
-    }
+    })
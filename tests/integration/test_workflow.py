@@ -1,6 +1,8 @@
 """Integration tests for complete workflow."""
 
-import pytest
+import asyncio
+from typing import Mapping
+
 from unittest.mock import Mock, AsyncMock, patch
 
 from src.orchestrator.workflow import WorkflowOrchestrator
@@ -10,7 +12,6 @@ from src.config import Settings
 class TestWorkflowIntegration:
     """Test complete workflow integration."""
 
-    @pytest.mark.asyncio
     async def test_health_check(self, settings: Settings):
         """Test health check integration."""
         # Create mocked components
@@ -44,14 +45,99 @@ class TestWorkflowIntegration:
         assert health["components"]["vector_store"]["status"] == "healthy"
         assert health["components"]["vector_store"]["document_count"] == 10
 
-    @pytest.mark.asyncio
+    async def test_health_check_degraded_on_probe_exception(self, settings: Settings):
+        """Test a failing probe marks its component unhealthy and overall degraded."""
+        retriever = Mock()
+        retriever.vector_store = Mock()
+        retriever.vector_store.count = Mock(return_value=10)
+
+        generator = Mock()
+        generator.check_health = AsyncMock(return_value=True)
+
+        servicenow_client = Mock()
+        servicenow_client.check_health = AsyncMock(side_effect=Exception("Connection refused"))
+
+        orchestrator = WorkflowOrchestrator(
+            settings=settings,
+            retriever=retriever,
+            generator=generator,
+            servicenow_client=servicenow_client,
+            incident_builder=Mock(),
+        )
+
+        health = await orchestrator.health_check()
+
+        assert health["overall"] == "degraded"
+        assert health["components"]["servicenow"] == "unhealthy"
+        assert health["components"]["llm"] == "healthy"
+        assert health["components"]["vector_store"]["status"] == "healthy"
+        assert health["components"]["teams"] == "disabled"
+
+    async def test_health_check_cancelled_probe_is_unhealthy(self, settings: Settings):
+        """Test a probe that ends cancelled is reported unhealthy, not healthy."""
+        retriever = Mock()
+        retriever.vector_store = Mock()
+        retriever.vector_store.count = Mock(return_value=10)
+
+        generator = Mock()
+        generator.check_health = AsyncMock(side_effect=asyncio.CancelledError())
+
+        servicenow_client = Mock()
+        servicenow_client.check_health = AsyncMock(return_value=True)
+
+        orchestrator = WorkflowOrchestrator(
+            settings=settings,
+            retriever=retriever,
+            generator=generator,
+            servicenow_client=servicenow_client,
+            incident_builder=Mock(),
+        )
+
+        health = await orchestrator.health_check()
+
+        assert health["overall"] == "degraded"
+        assert health["components"]["llm"] == "unhealthy"
+        assert health["components"]["servicenow"] == "healthy"
+
+    async def test_health_check_degraded_when_teams_unhealthy(self, settings: Settings):
+        """Test an unhealthy Teams webhook degrades overall health."""
+        retriever = Mock()
+        retriever.vector_store = Mock()
+        retriever.vector_store.count = Mock(return_value=10)
+
+        generator = Mock()
+        generator.check_health = AsyncMock(return_value=True)
+
+        servicenow_client = Mock()
+        servicenow_client.check_health = AsyncMock(return_value=True)
+
+        teams_client = Mock()
+        teams_client.is_enabled = True
+        teams_client.check_health = AsyncMock(return_value=False)
+
+        orchestrator = WorkflowOrchestrator(
+            settings=settings,
+            retriever=retriever,
+            generator=generator,
+            servicenow_client=servicenow_client,
+            incident_builder=Mock(),
+            teams_client=teams_client,
+        )
+
+        health = await orchestrator.health_check()
+
+        assert health["overall"] == "degraded"
+        assert health["components"]["teams"] == "unhealthy"
+        assert health["components"]["llm"] == "healthy"
+        assert health["components"]["servicenow"] == "healthy"
+
     async def test_process_email_workflow(
-        self, settings: Settings, sample_email_data: dict, sample_llm_output: dict
+        self, settings: Settings, sample_email_data: Mapping, sample_llm_output: Mapping
     ):
         """Test complete email processing workflow."""
         # Create mocked components
         retriever = Mock()
-        retriever.retrieve_with_context = Mock(
+        retriever.retrieve_with_context = AsyncMock(
             return_value={
                 "context": "Sample context from knowledge base",
                 "sources": [{"title": "KB Article 1", "url": "http://kb.com/1"}],
@@ -91,17 +177,101 @@ class TestWorkflowIntegration:
         assert result["kb_sources_count"] == 1
 
         # Verify components were called
-        retriever.retrieve_with_context.assert_called_once()
+        retriever.retrieve_with_context.assert_awaited_once()
         generator.generate_incident_summary.assert_called_once()
         servicenow_client.create_incident.assert_called_once()
         incident_builder.build_from_llm_output.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_workflow_fallback_on_error(self, settings: Settings, sample_email_data: dict):
+    async def test_disabled_teams_client_not_called(
+        self, settings: Settings, sample_email_data: Mapping, sample_llm_output: Mapping
+    ):
+        """Test no Teams notification is attempted when Teams is disabled."""
+        retriever = Mock()
+        retriever.retrieve_with_context = AsyncMock(
+            return_value={"context": "", "sources": []}
+        )
+
+        generator = Mock()
+        generator.generate_incident_summary = AsyncMock(return_value=sample_llm_output)
+
+        servicenow_client = Mock()
+        servicenow_client.create_incident = AsyncMock(
+            return_value={"number": "INC0004", "sys_id": "off123"}
+        )
+
+        incident_builder = Mock()
+        incident_builder.build_from_llm_output = Mock(
+            return_value={"short_description": "Test incident"}
+        )
+
+        teams_client = Mock()
+        teams_client.is_enabled = False
+        teams_client.send_incident_notification = AsyncMock()
+
+        orchestrator = WorkflowOrchestrator(
+            settings=settings,
+            retriever=retriever,
+            generator=generator,
+            servicenow_client=servicenow_client,
+            incident_builder=incident_builder,
+            teams_client=teams_client,
+        )
+
+        result = await orchestrator.process_email(sample_email_data)
+
+        assert result["success"] is True
+        teams_client.send_incident_notification.assert_not_awaited()
+
+    async def test_duplicate_emails_share_one_workflow(
+        self, settings: Settings, sample_email_data: Mapping, sample_llm_output: Mapping
+    ):
+        """Test concurrent identical emails create a single incident."""
+        retriever = Mock()
+        retriever.retrieve_with_context = AsyncMock(
+            return_value={"context": "", "sources": []}
+        )
+
+        generator = Mock()
+        generator.generate_incident_summary = AsyncMock(return_value=sample_llm_output)
+
+        servicenow_client = Mock()
+        servicenow_client.create_incident = AsyncMock(
+            return_value={"number": "INC0003", "sys_id": "dup123"}
+        )
+
+        incident_builder = Mock()
+        incident_builder.build_from_llm_output = Mock(
+            return_value={"short_description": "Test incident"}
+        )
+
+        orchestrator = WorkflowOrchestrator(
+            settings=settings,
+            retriever=retriever,
+            generator=generator,
+            servicenow_client=servicenow_client,
+            incident_builder=incident_builder,
+        )
+
+        first, second = await asyncio.gather(
+            orchestrator.process_email(sample_email_data),
+            orchestrator.process_email(dict(sample_email_data)),
+        )
+
+        assert first == second
+        assert first is not second
+        assert first["incident_number"] == "INC0003"
+
+        # One caller mutating its result must not leak into the other's
+        first["incident_number"] = "changed"
+        assert second["incident_number"] == "INC0003"
+        servicenow_client.create_incident.assert_awaited_once()
+        assert orchestrator._inflight == {}
+
+    async def test_workflow_fallback_on_error(self, settings: Settings, sample_email_data: Mapping):
         """Test workflow fallback when main process fails."""
         # Create mocked components that fail
         retriever = Mock()
-        retriever.retrieve_with_context = Mock(side_effect=Exception("Retrieval failed"))
+        retriever.retrieve_with_context = AsyncMock(side_effect=Exception("Retrieval failed"))
 
         generator = Mock()
         servicenow_client = Mock()
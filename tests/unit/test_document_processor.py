@@ -1,22 +1,25 @@
 """Unit tests for DocumentProcessor."""
 
 import pytest
+
 from src.ingestion.document_processor import DocumentProcessor
 from src.config import Settings
 
+pytestmark = pytest.mark.unit
+
 
 class TestDocumentProcessor:
     """Test DocumentProcessor class."""
 
-    def test_processor_initialization(self, settings: Settings):
+    def test_processor_initialization(self, processor: DocumentProcessor, settings: Settings):
         """Test processor initialization."""
-        processor = DocumentProcessor(settings)
         assert processor.chunk_size == settings.rag_chunk_size
         assert processor.chunk_overlap == settings.rag_chunk_overlap
 
-    def test_process_single_document(self, settings: Settings, sample_confluence_docs: list):
+    def test_process_single_document(
+        self, processor: DocumentProcessor, sample_confluence_docs: tuple
+    ):
         """Test processing single document."""
-        processor = DocumentProcessor(settings)
         documents = [sample_confluence_docs[0]]
 
         chunks = processor.process_documents(documents)
@@ -26,20 +29,18 @@ class TestDocumentProcessor:
         assert all("metadata" in chunk for chunk in chunks)
         assert all("chunk_id" in chunk for chunk in chunks)
 
-    def test_process_multiple_documents(self, settings: Settings, sample_confluence_docs: list):
+    def test_process_multiple_documents(
+        self, processor: DocumentProcessor, sample_confluence_docs: tuple
+    ):
         """Test processing multiple documents."""
-        processor = DocumentProcessor(settings)
-
         chunks = processor.process_documents(sample_confluence_docs)
 
         assert len(chunks) > 0
         # Should create multiple chunks from multiple documents
         assert len(chunks) >= len(sample_confluence_docs)
 
-    def test_chunk_metadata(self, settings: Settings, sample_confluence_docs: list):
+    def test_chunk_metadata(self, processor: DocumentProcessor, sample_confluence_docs: tuple):
         """Test chunk metadata contains required fields."""
-        processor = DocumentProcessor(settings)
-
         chunks = processor.process_documents(sample_confluence_docs)
 
         for chunk in chunks:
@@ -53,9 +54,8 @@ class TestDocumentProcessor:
             assert "title" in chunk
             assert "document_id" in chunk
 
-    def test_chunk_size_limit(self, settings: Settings):
+    def test_chunk_size_limit(self, processor: DocumentProcessor, settings: Settings):
         """Test that chunks respect size limits."""
-        processor = DocumentProcessor(settings)
         # Create a very long document
         long_doc = {
             "id": "test_001",
@@ -74,9 +74,10 @@ class TestDocumentProcessor:
         for chunk in chunks:
             assert len(chunk["content"]) <= settings.rag_chunk_size * 1.5
 
-    def test_create_metadata_text(self, settings: Settings, sample_confluence_docs: list):
+    def test_create_metadata_text(
+        self, processor: DocumentProcessor, sample_confluence_docs: tuple
+    ):
         """Test metadata text creation for embedding."""
-        processor = DocumentProcessor(settings)
         chunks = processor.process_documents(sample_confluence_docs)
 
         metadata_text = processor.create_metadata_text(chunks[0])
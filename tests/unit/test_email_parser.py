@@ -4,57 +4,85 @@ import pytest
 from email.message import EmailMessage
 from src.email_receiver.email_parser import EmailParser
 
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(scope="module")
+def parser() -> EmailParser:
+    """EmailParser shared by the module (it holds no state)."""
+    return EmailParser()
+
+
+@pytest.fixture(scope="module")
+def simple_email_bytes() -> bytes:
+    """Plain text email, serialized once per module."""
+    msg = EmailMessage()
+    msg["From"] = "test@example.com"
+    msg["To"] = "support@example.com"
+    msg["Subject"] = "Test Subject"
+    msg.set_content("Test email body content.")
+    return msg.as_bytes()
+
+
+@pytest.fixture(scope="module")
+def multipart_email_bytes() -> bytes:
+    """Plain text plus HTML alternative email, serialized once per module."""
+    msg = EmailMessage()
+    msg["From"] = "sender@example.com"
+    msg["To"] = "recipient@example.com"
+    msg["Subject"] = "Multipart Test"
+    msg.set_content("Plain text body.")
+    msg.add_alternative("<html><body><p>HTML body</p></body></html>", subtype="html")
+    return msg.as_bytes()
+
+
+@pytest.fixture(scope="module")
+def display_name_email_bytes() -> bytes:
+    """Email whose From header carries a display name, serialized once per module."""
+    msg = EmailMessage()
+    msg["From"] = "John Doe <john@example.com>"
+    msg["Subject"] = "Test"
+    msg.set_content("Body")
+    return msg.as_bytes()
+
+
+@pytest.fixture(scope="module")
+def headerless_email_bytes() -> bytes:
+    """Email with a body but no headers, serialized once per module."""
+    msg = EmailMessage()
+    msg.set_content("Just a body, no headers.")
+    return msg.as_bytes()
+
 
 class TestEmailParser:
     """Test EmailParser class."""
 
-    def test_parse_simple_email(self):
-        """Test parsing simple text email."""
-        # Create email message
-        msg = EmailMessage()
-        msg["From"] = "test@example.com"
-        msg["To"] = "support@example.com"
-        msg["Subject"] = "Test Subject"
-        msg.set_content("Test email body content.")
-
-        parser = EmailParser()
-        parsed = parser.parse_email(msg.as_bytes())
-
-        assert parsed["from"] == "test@example.com"
-        assert parsed["subject"] == "Test Subject"
-        assert "Test email body content" in parsed["body"]
-
-    def test_parse_multipart_email(self):
-        """Test parsing multipart email."""
-        msg = EmailMessage()
-        msg["From"] = "sender@example.com"
-        msg["To"] = "recipient@example.com"
-        msg["Subject"] = "Multipart Test"
-        msg.set_content("Plain text body.")
-        msg.add_alternative("<html><body><p>HTML body</p></body></html>", subtype="html")
-
-        parser = EmailParser()
-        parsed = parser.parse_email(msg.as_bytes())
-
-        assert parsed["from"] == "sender@example.com"
-        assert "Plain text body" in parsed["body"]
-
-    def test_extract_from_address(self):
-        """Test extracting from address."""
-        msg = EmailMessage()
-        msg["From"] = "John Doe <john@example.com>"
-        msg["Subject"] = "Test"
-        msg.set_content("Body")
-
-        parser = EmailParser()
-        parsed = parser.parse_email(msg.as_bytes())
-
-        assert parsed["from"] == "john@example.com"
-
-    def test_clean_body(self):
+    @pytest.mark.parametrize(
+        "email_fixture,sender,subject,body",
+        [
+            ("simple_email_bytes", "test@example.com", "Test Subject", "Test email body content"),
+            ("multipart_email_bytes", "sender@example.com", "Multipart Test", "Plain text body"),
+            ("display_name_email_bytes", "john@example.com", "Test", "Body"),
+        ],
+    )
+    def test_parse_email(
+        self,
+        request: pytest.FixtureRequest,
+        parser: EmailParser,
+        email_fixture: str,
+        sender: str,
+        subject: str,
+        body: str,
+    ):
+        """Test parsing plain, multipart and display-name emails."""
+        parsed = parser.parse_email(request.getfixturevalue(email_fixture))
+
+        assert parsed["from"] == sender
+        assert parsed["subject"] == subject
+        assert body in parsed["body"]
+
+    def test_clean_body(self, parser: EmailParser):
         """Test body cleaning."""
-        parser = EmailParser()
-
         # Test with HTML content
         html_body = "<html><body><p>Line 1</p><br/><br/><p>Line 2</p></body></html>"
         cleaned = parser._strip_html(html_body)
@@ -64,26 +92,16 @@ class TestEmailParser:
         assert "Line 1" in cleaned
         assert "Line 2" in cleaned
 
-    def test_parse_with_missing_fields(self):
-        """Test parsing email with missing fields."""
-        msg = EmailMessage()
-        msg.set_content("Just a body, no headers.")
+    @pytest.mark.parametrize("email_fixture", ["headerless_email_bytes", None])
+    def test_parse_with_missing_fields(
+        self, request: pytest.FixtureRequest, parser: EmailParser, email_fixture
+    ):
+        """Test headerless and empty emails parse with default values."""
+        raw_email = request.getfixturevalue(email_fixture) if email_fixture else b""
 
-        parser = EmailParser()
-        parsed = parser.parse_email(msg.as_bytes())
+        parsed = parser.parse_email(raw_email)
 
         # Should have default/empty values
         assert "from" in parsed
         assert "subject" in parsed
         assert "body" in parsed
-
-    def test_parse_empty_email(self):
-        """Test parsing empty email."""
-        parser = EmailParser()
-
-        # Empty email should parse successfully with empty values
-        parsed = parser.parse_email(b"")
-
-        assert "from" in parsed
-        assert "subject" in parsed
-        assert "body" in parsed
@@ -1,36 +1,36 @@
 """Unit tests for Embedder."""
 
+import numpy as np
 import pytest
+
 from src.ingestion.embedder import Embedder
 from src.config import Settings
 
+pytestmark = pytest.mark.unit
+
 
 class TestEmbedder:
     """Test Embedder class."""
 
-    def test_embedder_initialization(self, settings: Settings):
+    def test_embedder_initialization(self, embedder: Embedder, settings: Settings):
         """Test embedder initialization."""
-        embedder = Embedder(settings)
         assert embedder.model is not None
         assert embedder.model_name == settings.embedding_model
 
-    def test_embed_single_text(self, settings: Settings):
+    def test_embed_single_text(self, embedder: Embedder):
         """Test embedding single text."""
-        embedder = Embedder(settings)
         text = "This is a test document for embedding."
 
         # embed_batch works for single text too
         embeddings = embedder.embed_batch([text])
         embedding = embeddings[0]
 
-        assert embedding is not None
-        assert len(embedding) > 0
-        assert isinstance(embedding, list)
-        assert all(isinstance(x, float) for x in embedding)
+        assert embedding.dtype == np.float32
+        assert embedding.ndim == 1
+        assert embedding.size > 0
 
-    def test_embed_batch(self, settings: Settings):
+    def test_embed_batch(self, embedder: Embedder):
         """Test embedding batch of texts."""
-        embedder = Embedder(settings)
         texts = [
             "First test document.",
             "Second test document.",
@@ -39,23 +39,20 @@ class TestEmbedder:
 
         embeddings = embedder.embed_batch(texts)
 
-        assert len(embeddings) == len(texts)
-        assert all(len(emb) > 0 for emb in embeddings)
-        assert all(isinstance(emb, list) for emb in embeddings)
+        assert isinstance(embeddings, np.ndarray)
+        assert embeddings.dtype == np.float32
+        assert embeddings.shape == (len(texts), embedder.get_embedding_dimension())
 
-    def test_embed_empty_text(self, settings: Settings):
+    def test_embed_empty_text(self, embedder: Embedder):
         """Test embedding empty text."""
-        embedder = Embedder(settings)
-
         embeddings = embedder.embed_batch([""])
         embedding = embeddings[0]
 
         assert embedding is not None
         assert len(embedding) > 0
 
-    def test_embedding_dimension_consistency(self, settings: Settings):
+    def test_embedding_dimension_consistency(self, embedder: Embedder):
         """Test that all embeddings have the same dimension."""
-        embedder = Embedder(settings)
         texts = [
             "Short text.",
             "This is a much longer text with more words and content.",
@@ -64,5 +61,12 @@ class TestEmbedder:
 
         embeddings = embedder.embed_batch(texts)
 
-        dimensions = [len(emb) for emb in embeddings]
-        assert len(set(dimensions)) == 1, "All embeddings should have same dimension"
+        assert embeddings.ndim == 2, "All embeddings should have same dimension"
+        assert embeddings.shape[0] == len(texts)
+
+    def test_embed_no_texts(self, embedder: Embedder):
+        """Test an empty batch returns an empty 2-d float32 array."""
+        embeddings = embedder.embed_batch([])
+
+        assert embeddings.dtype == np.float32
+        assert embeddings.shape == (0, embedder.get_embedding_dimension())
@@ -0,0 +1,183 @@
+"""Unit tests for Generator."""
+
+import httpx
+import orjson
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.rag.generator import Generator, _JsonObjectTracker
+from src.config import Settings
+
+pytestmark = pytest.mark.unit
+
+
+def _feed_all(chunks):
+    """Feed chunks to a fresh tracker; return the index of the closing chunk or None."""
+    tracker = _JsonObjectTracker()
+    for idx, chunk in enumerate(chunks):
+        if tracker.feed(chunk):
+            return idx
+    return None
+
+
+class TestJsonObjectTracker:
+    """Test _JsonObjectTracker class."""
+
+    def test_braces_inside_strings(self):
+        """Test braces inside string values do not close the object."""
+        assert _feed_all(['{"text": "a } b { c"', ', "n": 1}']) == 1
+
+    def test_escaped_quotes(self):
+        """Test escaped quotes do not end a string early."""
+        assert _feed_all(['{"text": "say \\"}\\" now"', "}"]) == 1
+
+    def test_object_split_across_chunks(self):
+        """Test an object split over many chunks closes on the final brace."""
+        chunks = ["Here you go: {", '"short', '_description": "x",', ' "urgency": 2', "}"]
+        assert _feed_all(chunks) == 4
+
+    def test_braces_in_prose_ignored(self):
+        """Test balanced braces in leading prose do not end the stream."""
+        assert _feed_all(["Note: use {braces}. ", '{"a": 1}', " trailing"]) == 1
+
+    def test_incomplete_object(self):
+        """Test an unclosed object is never reported complete."""
+        assert _feed_all(['{"a": {"b": 1}']) is None
+
+
+class TestGeneratorStreaming:
+    """Test streamed Ollama generation."""
+
+    async def test_stream_closed_after_json(self, settings: Settings, mock_http_transport):
+        """Test the stream stops being read once the JSON object is complete."""
+        generator = Generator(settings)
+        lines = [
+            {"response": '{"short_description": ', "done": False},
+            {"response": '"Disk full"}', "done": False},
+            {"response": " Explanation that should never be read", "done": False},
+            {"response": "", "done": True},
+        ]
+        consumed = []
+
+        async def stream():
+            for line in lines:
+                consumed.append(line)
+                yield orjson.dumps(line) + b"\n"
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            payload = orjson.loads(request.content)
+            assert payload["stream"] is True
+            assert payload["format"] == "json"
+            return httpx.Response(200, content=stream())
+
+        with mock_http_transport("src.rag.generator", handler):
+            text = await generator._call_ollama("prompt", json_mode=True)
+
+        assert text == '{"short_description": "Disk full"}'
+        assert len(consumed) == 2
+
+    async def test_stream_error_line_raises(self, settings: Settings, mock_http_transport):
+        """Test an error line in the stream raises instead of returning partial text."""
+        generator = Generator(settings)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=orjson.dumps({"error": "model not found"}))
+
+        with mock_http_transport("src.rag.generator", handler):
+            with pytest.raises(RuntimeError, match="model not found"):
+                await generator._call_ollama("prompt")
+
+
+def _fallback_summary(email_content: str, error: str) -> dict:
+    """Minimal summary generate_incident_summary returns when the LLM output is unusable."""
+    return {
+        "short_description": "Incident from email",
+        "description": email_content[:500],
+        "category": "Incident",
+        "urgency": 3,
+        "impact": 3,
+        "recommended_actions": [],
+        "kb_references": [],
+        "has_kb_match": False,
+        "error": error,
+    }
+
+
+class TestGeneratorIncidentSummary:
+    """Test parsing of the LLM incident summary."""
+
+    async def test_json_object_parsed(self, settings: Settings):
+        """Test a JSON object response is returned with metadata added."""
+        generator = Generator(settings)
+        response = '{"short_description": "Disk full", "urgency": 2}'
+
+        with patch.object(generator, "_call_ollama", AsyncMock(return_value=response)):
+            summary = await generator.generate_incident_summary("Body", "Context")
+
+        assert summary == {
+            "short_description": "Disk full",
+            "urgency": 2,
+            "has_kb_match": True,
+            "raw_llm_response": response,
+        }
+
+    @pytest.mark.parametrize("response", ['["Disk full"]', "42", '"Disk full"'])
+    async def test_non_object_json_falls_back(self, settings: Settings, response: str):
+        """Test a JSON array or scalar response yields the minimal fallback summary."""
+        generator = Generator(settings)
+
+        with patch.object(generator, "_call_ollama", AsyncMock(return_value=response)):
+            summary = await generator.generate_incident_summary("Body", "Context")
+
+        assert summary == _fallback_summary("Body", "LLM response is not a JSON object")
+
+    async def test_malformed_text_falls_back(self, settings: Settings):
+        """Test non-JSON text yields the minimal fallback summary with the parse error."""
+        generator = Generator(settings)
+        response = "Sorry, I cannot help with that."
+        with pytest.raises(orjson.JSONDecodeError) as parse_error:
+            orjson.loads(response)
+
+        with patch.object(generator, "_call_ollama", AsyncMock(return_value=response)):
+            summary = await generator.generate_incident_summary("Body", "Context")
+
+        assert summary == _fallback_summary("Body", str(parse_error.value))
+
+
+class TestGeneratorHealth:
+    """Test Generator health check caching."""
+
+    async def test_health_cached_within_ttl(self, settings: Settings, mock_http_transport):
+        """Test a second check inside the TTL does not call /api/tags."""
+        generator = Generator(settings)
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            return httpx.Response(200, json={"models": [{"name": settings.llm_model}]})
+
+        with mock_http_transport("src.rag.generator", handler):
+            assert await generator.check_health() is True
+            assert await generator.check_health() is True
+
+        assert calls == ["/api/tags"]
+
+    async def test_health_refreshed_after_ttl(self, settings: Settings, mock_http_transport):
+        """Test a check after the TTL expires calls /api/tags again."""
+        generator = Generator(settings)
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            return httpx.Response(200, json={"models": []})
+
+        with mock_http_transport("src.rag.generator", handler):
+            assert await generator.check_health() is False
+
+            # Age the cached entry past the TTL
+            checked_at, healthy = generator._health_cache
+            generator._health_cache = (checked_at - Generator.HEALTH_CACHE_TTL - 1, healthy)
+
+            assert await generator.check_health() is False
+
+        assert calls == ["/api/tags", "/api/tags"]
@@ -1,98 +1,169 @@
 """Unit tests for IncidentBuilder."""
 
+import numpy as np
 import pytest
+from datetime import datetime, timezone
+from typing import Mapping
+
 from src.servicenow.incident_builder import IncidentBuilder
 from src.config import Settings
 
+pytestmark = pytest.mark.unit
+
+EMAIL_FROM = "test@example.com"
+SUBJECT_DB = "Database Issues"
+SUBJECT_TEST = "Test Issue"
+BODY = "This is a test issue description."
+
+# Field -> predicate its value must satisfy in an incident built from LLM output
+_LLM_FIELD_CHECKS = {
+    "short_description": bool,
+    "description": bool,
+    "priority": lambda v: v in {1, 2, 3, 4, 5},
+    "urgency": lambda v: True,
+    "impact": lambda v: True,
+    "category": lambda v: True,
+    "caller_id": lambda v: v == EMAIL_FROM,
+}
+
+
+@pytest.fixture(scope="module")
+def builder(settings: Settings) -> IncidentBuilder:
+    """IncidentBuilder shared by the module."""
+    return IncidentBuilder(settings)
+
+
+@pytest.fixture(scope="module")
+def llm_incident(builder: IncidentBuilder, sample_llm_output: Mapping) -> dict:
+    """Incident built once from the sample LLM output."""
+    return builder.build_from_llm_output(
+        llm_output=sample_llm_output,
+        email_from=EMAIL_FROM,
+        email_subject=SUBJECT_DB,
+    )
+
 
 class TestIncidentBuilder:
     """Test IncidentBuilder class."""
 
-    def test_builder_initialization(self, settings: Settings):
+    def test_builder_initialization(self, builder: IncidentBuilder, settings: Settings):
         """Test builder initialization."""
-        builder = IncidentBuilder(settings)
         assert builder.settings == settings
 
-    def test_build_from_email(self, settings: Settings):
+    def test_build_from_email(self, builder: IncidentBuilder):
         """Test building incident from email."""
-        builder = IncidentBuilder(settings)
-
         incident = builder.build_from_email(
-            email_from="test@example.com",
-            email_subject="Test Issue",
-            email_body="This is a test issue description.",
+            email_from=EMAIL_FROM,
+            email_subject=SUBJECT_TEST,
+            email_body=BODY,
         )
 
-        assert "short_description" in incident
-        assert "description" in incident
-        assert "caller_id" in incident
-        assert incident["caller_id"] == "test@example.com"
-        assert "Test Issue" in incident["short_description"]
-
-    def test_build_from_llm_output(self, settings: Settings, sample_llm_output: dict):
-        """Test building incident from LLM output."""
-        builder = IncidentBuilder(settings)
-
-        incident = builder.build_from_llm_output(
-            llm_output=sample_llm_output,
-            email_from="test@example.com",
-            email_subject="Database Issues",
+        assert incident["short_description"] == SUBJECT_TEST
+        assert incident["description"].startswith(
+            f"Email Subject: {SUBJECT_TEST}\nEmail From: {EMAIL_FROM}\nReceived: "
         )
+        assert incident["caller_id"] == EMAIL_FROM
 
-        assert "short_description" in incident
-        assert "description" in incident
-        assert "priority" in incident
-        assert "urgency" in incident
-        assert "category" in incident
-        assert incident["caller_id"] == "test@example.com"
+    @pytest.mark.parametrize("key,check", _LLM_FIELD_CHECKS.items(), ids=list(_LLM_FIELD_CHECKS))
+    def test_llm_incident_fields(self, llm_incident: dict, key: str, check):
+        """Test each field of an incident built from LLM output."""
+        assert key in llm_incident
+        assert check(llm_incident[key])
 
-    def test_priority_from_llm_output(self, settings: Settings, sample_llm_output: dict):
-        """Test priority is set from LLM output."""
-        builder = IncidentBuilder(settings)
-
-        incident = builder.build_from_llm_output(
-            llm_output=sample_llm_output,
-            email_from="test@example.com",
-            email_subject="Database Issues",
-        )
-
-        # Priority should be set based on urgency and impact from LLM output
-        assert "priority" in incident
-        assert "urgency" in incident
-        assert "impact" in incident
-        # Priority is returned as integer
-        assert incident["priority"] in [1, 2, 3, 4, 5]
-
-    def test_add_work_note(self, settings: Settings):
+    def test_add_work_note(self, builder: IncidentBuilder):
         """Test work note addition."""
-        builder = IncidentBuilder(settings)
-
         work_note = builder.add_work_note("Test work note")
 
-        assert "work_notes" in work_note
-        assert "Test work note" in work_note["work_notes"]
+        assert work_note["work_notes"].startswith("[")
+        assert work_note["work_notes"].endswith("Z] Test work note")
+
+    def test_add_work_note_with_shared_timestamp(self, builder: IncidentBuilder):
+        """Test notes stamped with one shared timestamp use UTC seconds precision."""
+        ts = datetime(2024, 1, 2, 3, 4, 5, 678, tzinfo=timezone.utc)
+
+        note = builder.add_work_note("First", timestamp=ts)
+        comment = builder.add_comment("Second", timestamp=ts)
+
+        assert note["work_notes"] == "[2024-01-02T03:04:05Z] First"
+        assert comment["comments"] == "[2024-01-02T03:04:05Z] Second"
+
+    @pytest.mark.parametrize(
+        "urgency,impact,expected",
+        [
+            (1, 1, 1),
+            (1, 2, 1),
+            (1, 3, 1),
+            (2, 1, 1),
+            (2, 2, 1),
+            (2, 3, 2),
+            (3, 1, 1),
+            (3, 2, 2),
+            (3, 3, 3),
+        ],
+    )
+    def test_priority_calculation(
+        self, builder: IncidentBuilder, urgency: int, impact: int, expected: int
+    ):
+        """Test priority calculation across the high-to-moderate urgency/impact matrix."""
+        assert builder._calculate_priority(urgency=urgency, impact=impact) == expected
+
+    @pytest.mark.parametrize("urgency,impact", [(0, 3), (3, 0), (-1, 2), (6, 1), (2, 6)])
+    def test_priority_rejects_out_of_range(
+        self, builder: IncidentBuilder, urgency: int, impact: int
+    ):
+        """Test out-of-range levels raise instead of wrapping around the lookup table."""
+        with pytest.raises(ValueError):
+            builder._calculate_priority(urgency=urgency, impact=impact)
+        with pytest.raises(ValueError):
+            builder._calculate_priority_vec(np.array([urgency]), np.array([impact]))
+
+    def test_priority_table_matches_average_rule(self, builder: IncidentBuilder):
+        """Test the lookup table agrees with the averaging thresholds for every pair."""
+        def by_average(urgency: int, impact: int) -> int:
+            avg = (urgency + impact) / 2
+            for limit, priority in ((2, 1), (2.5, 2), (3.5, 3), (4.5, 4)):
+                if avg <= limit:
+                    return priority
+            return 5
+
+        pairs = [(u, i) for u in range(1, 6) for i in range(1, 6)]
+        for urgency, impact in pairs:
+            assert builder._calculate_priority(urgency, impact) == by_average(urgency, impact)
+
+        urgencies, impacts = np.array(pairs).T
+        assert builder._calculate_priority_vec(urgencies, impacts).tolist() == [
+            by_average(u, i) for u, i in pairs
+        ]
+
+    def test_short_description_fits_byte_limit(self, builder: IncidentBuilder):
+        """Test short descriptions are whitespace-collapsed and cut on a character boundary."""
+        incident = builder.build_from_llm_output(
+            llm_output={"short_description": "  Disk\n  full " + "é" * 100},
+            email_from=EMAIL_FROM,
+            email_subject=SUBJECT_TEST,
+        )
 
-    def test_priority_calculation(self, settings: Settings):
-        """Test priority calculation from urgency and impact."""
-        builder = IncidentBuilder(settings)
+        short_description = incident["short_description"]
+        assert short_description.startswith("Disk full é")
+        assert len(short_description.encode("utf-8")) <= 160
+        assert short_description.endswith("é")
 
-        # Test internal priority calculation logic
-        # High urgency + high impact = high priority (1)
-        priority_high = builder._calculate_priority(urgency=1, impact=1)
-        assert priority_high == 1, f"Expected priority 1 but got {priority_high}"
+    def test_blank_subject_uses_fallback(self, builder: IncidentBuilder):
+        """Test a whitespace-only subject falls back to the default short description."""
+        incident = builder.build_from_email(
+            email_from=EMAIL_FROM,
+            email_subject="   \n  ",
+            email_body=BODY,
+        )
 
-        # Low urgency + low impact = low priority (4 or 5)
-        priority_low = builder._calculate_priority(urgency=3, impact=3)
-        assert priority_low in [3, 4, 5], f"Expected priority 3-5 but got {priority_low}"
+        assert incident["short_description"] == "Incident from email"
 
-    def test_default_values(self, settings: Settings):
+    def test_default_values(self, builder: IncidentBuilder, settings: Settings):
         """Test default values from settings."""
-        builder = IncidentBuilder(settings)
-
         incident = builder.build_from_email(
-            email_from="test@example.com",
-            email_subject="Test",
-            email_body="Test body",
+            email_from=EMAIL_FROM,
+            email_subject=SUBJECT_TEST,
+            email_body=BODY,
         )
 
         assert incident["assignment_group"] == settings.servicenow_assignment_group
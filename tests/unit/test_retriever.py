@@ -0,0 +1,137 @@
+"""Unit tests for Retriever helpers."""
+
+import asyncio
+
+import numpy as np
+import pytest
+from unittest.mock import Mock
+
+from src.rag.retriever import Retriever, _EmbeddingBatcher, _SemanticCache
+
+pytestmark = pytest.mark.unit
+
+
+def _single_bucket_cache(bucket_size: int = 10, ttl: float = 60.0) -> _SemanticCache:
+    """Build a 3-d cache whose single hyperplane puts every x > 0 vector in one bucket."""
+    cache = _SemanticCache(dimension=3, threshold=0.99, ttl=ttl, bucket_size=bucket_size)
+    cache.planes = np.array([[1.0], [0.0], [0.0]], dtype=np.float32)
+    return cache
+
+
+class TestSemanticCache:
+    """Test _SemanticCache class."""
+
+    def test_hit_above_threshold(self):
+        """Test a near-identical embedding returns the cached result."""
+        cache = _single_bucket_cache()
+        cache.put([1.0, 0.0, 0.0], {"context": "cached"})
+
+        assert cache.get([1.0, 0.01, 0.0]) == {"context": "cached"}
+
+    def test_miss_below_threshold(self):
+        """Test a dissimilar embedding in the same bucket is a miss."""
+        cache = _single_bucket_cache()
+        cache.put([1.0, 0.0, 0.0], {"context": "cached"})
+
+        assert cache.get([1.0, 1.0, 0.0]) is None
+
+    def test_bucket_lru_eviction(self):
+        """Test the least recently used entry is evicted from a full bucket."""
+        cache = _single_bucket_cache(bucket_size=2)
+        cache.put([1.0, 0.0, 0.0], {"context": "a"})
+        cache.put([1.0, 1.0, 0.0], {"context": "b"})
+
+        # Touch "a" so "b" becomes least recently used
+        assert cache.get([1.0, 0.0, 0.0]) == {"context": "a"}
+        cache.put([1.0, 0.0, 1.0], {"context": "c"})
+
+        assert cache.get([1.0, 1.0, 0.0]) is None
+        assert cache.get([1.0, 0.0, 0.0]) == {"context": "a"}
+        assert cache.get([1.0, 0.0, 1.0]) == {"context": "c"}
+
+    def test_expired_entry_is_miss(self):
+        """Test entries older than the TTL are not served."""
+        cache = _single_bucket_cache(ttl=0.0)
+        cache.put([1.0, 0.0, 0.0], {"context": "cached"})
+
+        assert cache.get([1.0, 0.0, 0.0]) is None
+
+    def test_zero_norm_embedding(self):
+        """Test a zero vector is neither stored nor matched."""
+        cache = _single_bucket_cache()
+        cache.threshold = 0.0
+        cache.put([0.0, 0.0, 0.0], {"context": "zero"})
+
+        assert cache.get([0.0, 0.0, 0.0]) is None
+        assert cache._buckets == {}
+
+
+class TestEmbeddingBatcher:
+    """Test _EmbeddingBatcher class."""
+
+    async def test_concurrent_embeds_share_one_batch_call(self):
+        """Test concurrent embed() calls are coalesced into one embed_batch call."""
+        embedder = Mock()
+        embedder.embed_batch = Mock(side_effect=lambda texts: [[float(len(t))] for t in texts])
+        batcher = _EmbeddingBatcher(embedder)
+
+        results = await asyncio.gather(
+            batcher.embed("a"),
+            batcher.embed("bb"),
+            batcher.embed("ccc"),
+        )
+
+        embedder.embed_batch.assert_called_once_with(["a", "bb", "ccc"])
+        assert results == [[1.0], [2.0], [3.0]]
+
+    async def test_embed_error_propagates_to_all_callers(self):
+        """Test a failing batch call raises in every waiting caller."""
+        embedder = Mock()
+        embedder.embed_batch = Mock(side_effect=RuntimeError("model failed"))
+        batcher = _EmbeddingBatcher(embedder)
+
+        results = await asyncio.gather(
+            batcher.embed("a"), batcher.embed("b"), return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    async def test_cancelled_flush_cancels_pending_callers(self):
+        """Test cancelling the flush task does not leave callers hanging."""
+        embedder = Mock()
+        batcher = _EmbeddingBatcher(embedder, window=10.0)
+
+        waiter = asyncio.create_task(batcher.embed("a"))
+        await asyncio.sleep(0)
+        batcher._flush_task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(waiter, timeout=1.0)
+        embedder.embed_batch.assert_not_called()
+
+
+class TestRetriever:
+    """Test Retriever class."""
+
+    async def test_similar_documents_use_stored_embedding(self, settings):
+        """Test similar-document search queries with the stored embedding, not re-embedding."""
+        vector_store = Mock()
+        vector_store.get_by_ids = Mock(return_value={"ids": ["doc_1"], "embeddings": [[0.1, 0.2]]})
+        vector_store.query = Mock(
+            return_value={
+                "ids": [["doc_1", "doc_2"]],
+                "documents": [["original", "neighbour"]],
+                "metadatas": [[{}, {}]],
+                "distances": [[0.0, 0.1]],
+            }
+        )
+        embedder = Mock()
+        retriever = Retriever(settings, vector_store, embedder)
+
+        similar = await retriever.get_similar_documents("doc_1", top_k=1)
+
+        assert [doc["id"] for doc in similar] == ["doc_2"]
+        vector_store.get_by_ids.assert_called_once_with(["doc_1"], include=["embeddings"])
+        assert vector_store.query.call_args.kwargs["query_embeddings"] == [[0.1, 0.2]]
+        embedder.embed_batch.assert_not_called()
+        embedder.embed_text.assert_not_called()
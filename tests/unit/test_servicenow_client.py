@@ -0,0 +1,108 @@
+"""Unit tests for ServiceNowClient."""
+
+import gzip
+import json
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from src.servicenow.client import ServiceNowClient
+from src.config import Settings
+
+pytestmark = pytest.mark.unit
+
+
+class TestServiceNowClient:
+    """Test ServiceNowClient class."""
+
+    async def test_requests_share_one_http_client(self, settings: Settings, mock_http_transport):
+        """Test all requests go through a single pooled AsyncClient."""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"result": {"number": "INC0001", "sys_id": "abc"}})
+
+        with mock_http_transport("src.servicenow.client", handler) as client_cls:
+            async with ServiceNowClient(settings) as client:
+                await client.create_incident({"short_description": "Test"})
+                await client.get_incident("abc")
+
+        assert client_cls.call_count == 1
+        assert [r.method for r in requests] == ["POST", "GET"]
+        assert requests[1].url.path == "/api/now/table/incident/abc"
+        assert all("authorization" in r.headers for r in requests)
+
+    async def test_search_incidents_fetches_pages(self, settings: Settings, mock_http_transport):
+        """Test large searches are split into offset pages and flattened in order."""
+        offsets = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            offset = int(request.url.params["sysparm_offset"])
+            limit = int(request.url.params["sysparm_limit"])
+            offsets.append((offset, limit))
+            return httpx.Response(
+                200, json={"result": [{"number": offset + i} for i in range(limit)]}
+            )
+
+        with mock_http_transport("src.servicenow.client", handler):
+            async with ServiceNowClient(settings) as client:
+                incidents = await client.search_incidents("active=true", limit=5, page_size=2)
+
+        assert sorted(offsets) == [(0, 2), (2, 2), (4, 1)]
+        assert [incident["number"] for incident in incidents] == [0, 1, 2, 3, 4]
+
+    async def test_retry_after_header_honored(self, settings: Settings, mock_http_transport):
+        """Test a 429 with Retry-After is retried after the server-given delay."""
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "0"}),
+            httpx.Response(200, json={"result": {"sys_id": "abc"}}),
+        ]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return responses.pop(0)
+
+        with mock_http_transport("src.servicenow.client", handler):
+            async with ServiceNowClient(settings) as client:
+                incident = await client.get_incident("abc")
+
+        assert incident == {"sys_id": "abc"}
+        assert responses == []
+
+    async def test_create_incidents_bulk(self, settings: Settings, mock_http_transport):
+        """Test bulk creation returns records in order and isolates failures."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            payload = json.loads(request.content)
+            if payload["short_description"] == "bad":
+                return httpx.Response(400, json={"error": "invalid"})
+            return httpx.Response(200, json={"result": {"number": payload["short_description"]}})
+
+        payloads = [{"short_description": name} for name in ("one", "bad", "two")]
+        with mock_http_transport("src.servicenow.client", handler), patch("asyncio.sleep"):
+            async with ServiceNowClient(settings) as client:
+                results = await client.create_incidents_bulk(payloads, concurrency=2)
+
+        assert results[0] == {"number": "one"}
+        assert isinstance(results[1], Exception)
+        assert results[2] == {"number": "two"}
+
+    async def test_large_request_body_is_gzipped(self, settings: Settings, mock_http_transport):
+        """Test large payloads are sent gzip-compressed and small ones as plain JSON."""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"result": {"sys_id": "abc"}})
+
+        with mock_http_transport("src.servicenow.client", handler):
+            async with ServiceNowClient(settings) as client:
+                await client.create_incident({"description": "x" * 5000})
+                await client.create_incident({"description": "short"})
+
+        large, small = requests
+        assert large.headers["content-encoding"] == "gzip"
+        assert json.loads(gzip.decompress(large.content)) == {"description": "x" * 5000}
+        assert "content-encoding" not in small.headers
+        assert json.loads(small.content) == {"description": "short"}
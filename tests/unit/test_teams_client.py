@@ -0,0 +1,157 @@
+"""Unit tests for TeamsClient."""
+
+import httpx
+import orjson
+import pytest
+from unittest.mock import patch
+
+from src.teams.client import TeamsClient
+from src.config import Settings
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def teams_settings(settings: Settings) -> Settings:
+    """Settings with Teams notifications enabled."""
+    return settings.model_copy(
+        update={"teams_enabled": True, "teams_webhook_url": "https://teams.example.com/webhook"}
+    )
+
+
+class TestTeamsClient:
+    """Test TeamsClient class."""
+
+    async def test_requests_share_one_http_client(
+        self, teams_settings: Settings, mock_http_transport
+    ):
+        """Test notifications and health checks reuse the pooled AsyncClient."""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200)
+
+        with mock_http_transport("src.teams.client", handler) as client_cls:
+            client = TeamsClient(teams_settings)
+            await client.startup()
+            assert await client.send_incident_notification({"number": "INC0001"}) is True
+            assert await client.check_health() is True
+            await client.aclose()
+
+        assert client_cls.call_count == 1
+        assert len(requests) == 2
+        assert all(r.url == "https://teams.example.com/webhook" for r in requests)
+        assert all(r.headers["content-type"] == "application/json" for r in requests)
+        card = orjson.loads(requests[0].content)
+        assert card["attachments"][0]["content"]["body"][0]["text"] == "New Incident: INC0001"
+
+    async def test_bulk_notifications(self, teams_settings: Settings, mock_http_transport):
+        """Test bulk sends report per-item success in input order."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(400 if b"INC0002" in request.content else 200)
+
+        items = [({"number": f"INC000{i}"}, None, None) for i in (1, 2, 3)]
+        with mock_http_transport("src.teams.client", handler), patch("asyncio.sleep"):
+            client = TeamsClient(teams_settings)
+            results = await client.send_incident_notifications_bulk(items)
+            await client.aclose()
+
+        assert results == [True, False, True]
+
+    async def test_transient_failure_retried(self, teams_settings: Settings, mock_http_transport):
+        """Test a failed POST is retried and the final success is reported."""
+        responses = [httpx.Response(503), httpx.Response(200)]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return responses.pop(0)
+
+        with mock_http_transport("src.teams.client", handler), patch("asyncio.sleep"):
+            client = TeamsClient(teams_settings)
+            assert await client.send_incident_notification({"number": "INC0001"}) is True
+            await client.aclose()
+
+        assert responses == []
+
+    async def test_permanent_client_error_not_retried(
+        self, teams_settings: Settings, mock_http_transport
+    ):
+        """Test a 400 response fails immediately without further attempts."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(400)
+
+        with mock_http_transport("src.teams.client", handler):
+            client = TeamsClient(teams_settings)
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.send_incident_notification({"number": "INC0001"})
+            await client.aclose()
+
+        assert len(calls) == 1
+
+    async def test_retry_after_header_honored(self, teams_settings: Settings, mock_http_transport):
+        """Test a 429 waits for the Retry-After delay before retrying."""
+        responses = [httpx.Response(429, headers={"Retry-After": "2"}), httpx.Response(200)]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return responses.pop(0)
+
+        with mock_http_transport("src.teams.client", handler), patch("asyncio.sleep") as sleep:
+            client = TeamsClient(teams_settings)
+            assert await client.send_incident_notification({"number": "INC0001"}) is True
+            await client.aclose()
+
+        sleep.assert_awaited_once_with(2.0)
+
+    def test_cards_do_not_share_mutable_state(self, teams_settings: Settings):
+        """Test cards built from the envelope template have independent bodies."""
+        client = TeamsClient(teams_settings)
+
+        first = client._build_adaptive_card({"number": "INC0001"})
+        second = client._build_adaptive_card({"number": "INC0002"})
+
+        first_content = first["attachments"][0]["content"]
+        second_content = second["attachments"][0]["content"]
+        assert first_content["type"] == "AdaptiveCard"
+        assert first_content["body"] is not second_content["body"]
+        assert first_content["body"][0]["text"] == "New Incident: INC0001"
+        assert second_content["body"][0]["text"] == "New Incident: INC0002"
+
+    def test_card_lists_llm_insights_and_top_sources(self, teams_settings: Settings):
+        """Test LLM insights are rendered and only the top three KB sources are listed."""
+        client = TeamsClient(teams_settings)
+        llm_summary = {
+            "description": "Pool exhausted",
+            "recommended_actions": ["Restart pool", "Raise limit"],
+            "kb_references": ["KB001"],
+        }
+        kb_sources = [{"url": f"https://kb/{i}", "score": 0.9 - i / 10} for i in range(5)]
+
+        card = client._build_adaptive_card({"number": "INC0001"}, llm_summary, kb_sources)
+
+        texts = [block.get("text") for block in card["attachments"][0]["content"]["body"]]
+        assert texts[3:] == [
+            "**Analysis:**",
+            "Pool exhausted",
+            "**Recommended Actions:**",
+            "• Restart pool\n• Raise limit",
+            "**Knowledge Base References:**",
+            "• KB001",
+            "5 relevant KB articles found",
+            "• [https://kb/0](https://kb/0) (Score: 0.90)",
+            "• [https://kb/1](https://kb/1) (Score: 0.80)",
+            "• [https://kb/2](https://kb/2) (Score: 0.70)",
+        ]
+
+    @pytest.mark.parametrize(
+        "priority,color",
+        [(1, "Attention"), (2, "Warning"), (3, "Accent"), (4, "Default"), (5, "Default")],
+    )
+    def test_priority_color(self, teams_settings: Settings, priority: int, color: str):
+        """Test each priority maps to its title color."""
+        client = TeamsClient(teams_settings)
+
+        assert client._get_priority_color(priority) == color
@@ -0,0 +1,276 @@
+"""Unit tests for VectorStore."""
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+from unittest.mock import Mock, patch
+
+from src.rag.vector_store import EmbeddingAccumulator, VectorStore
+from src.config import Settings
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def vector_store(settings: Settings, tmp_path) -> VectorStore:
+    """VectorStore backed by a mocked ChromaDB client."""
+    store_settings = settings.model_copy(
+        update={"vectordb_path": str(tmp_path), "vectordb_insert_batch_size": 2}
+    )
+    with patch("src.rag.vector_store.chromadb.PersistentClient") as client_cls:
+        client_cls.return_value.get_or_create_collection.return_value = Mock()
+        return VectorStore(store_settings)
+
+
+class TestVectorStore:
+    """Test VectorStore class."""
+
+    def test_add_documents_in_batches(self, vector_store: VectorStore):
+        """Test documents are written in insert_batch_size sub-batches."""
+        vector_store.add_documents(
+            documents=["a", "b", "c"],
+            metadatas=[{"n": 1}, {"n": 2}, {"n": 3}],
+            ids=["1", "2", "3"],
+        )
+
+        calls = vector_store.collection.add.call_args_list
+        assert [call.kwargs["ids"] for call in calls] == [["1", "2"], ["3"]]
+
+    def test_add_documents_with_array_embeddings(self, vector_store: VectorStore):
+        """Test an ndarray of embeddings is sliced per batch and passed as float32 rows."""
+        embeddings = np.arange(6, dtype=np.float64).reshape(3, 2)
+
+        vector_store.add_documents(
+            documents=["a", "b", "c"],
+            metadatas=[{}, {}, {}],
+            ids=["1", "2", "3"],
+            embeddings=embeddings,
+        )
+
+        calls = vector_store.collection.add.call_args_list
+        assert [call.kwargs["embeddings"] for call in calls] == [
+            [[0.0, 1.0], [2.0, 3.0]],
+            [[4.0, 5.0]],
+        ]
+
+    def test_query_with_array_embeddings(self, vector_store: VectorStore):
+        """Test query accepts an ndarray and rejects an empty one."""
+        vector_store.collection.query.return_value = {"ids": [[]]}
+
+        vector_store.query(query_embeddings=np.ones((1, 2), dtype=np.float32))
+
+        assert vector_store.collection.query.call_args.kwargs["query_embeddings"] == [[1.0, 1.0]]
+        with pytest.raises(ValueError):
+            vector_store.query(query_embeddings=np.empty((0, 2), dtype=np.float32))
+
+    def test_query_with_array_rows(self, vector_store: VectorStore):
+        """Test a list of embedding rows sliced from a batch array is converted to lists."""
+        vector_store.collection.query.return_value = {"ids": [[]]}
+        batch = np.array([[0.5, 0.25]], dtype=np.float32)
+
+        vector_store.query(query_embeddings=[batch[0]])
+
+        assert vector_store.collection.query.call_args.kwargs["query_embeddings"] == [[0.5, 0.25]]
+
+    async def test_aadd_documents_serializes_writes(self, vector_store: VectorStore):
+        """Test concurrent async adds run off the loop and never overlap."""
+        active = []
+        overlaps = []
+        lock = threading.Lock()
+
+        def add(**kwargs):
+            with lock:
+                active.append(kwargs["ids"])
+                overlaps.append(len(active) > 1)
+            time.sleep(0.01)
+            with lock:
+                active.remove(kwargs["ids"])
+
+        vector_store.collection.add.side_effect = add
+
+        await asyncio.gather(
+            vector_store.aadd_documents(["a"], [{}], ["1"]),
+            vector_store.aadd_documents(["b"], [{}], ["2"]),
+        )
+
+        assert vector_store.collection.add.call_count == 2
+        assert not any(overlaps)
+
+    def test_add_documents_streaming(self, vector_store: VectorStore):
+        """Test streaming ingest buffers records into batches."""
+        records = ((f"doc {i}", {"n": i}, str(i), None) for i in range(5))
+
+        added = vector_store.add_documents_streaming(records)
+
+        assert added == 5
+        calls = vector_store.collection.add.call_args_list
+        assert [call.kwargs["ids"] for call in calls] == [["0", "1"], ["2", "3"], ["4"]]
+
+    def test_add_documents_streaming_rejects_mixed_embeddings(self, vector_store: VectorStore):
+        """Test a record whose embedding presence differs from the first one is rejected."""
+        records = [("a", {}, "1", [0.1, 0.2]), ("b", {}, "2", None)]
+
+        with pytest.raises(ValueError, match="'2'"):
+            vector_store.add_documents_streaming(records)
+
+        vector_store.collection.add.assert_not_called()
+
+    def test_metadata_normalization(self, vector_store: VectorStore):
+        """Test metadata values are converted to ChromaDB-compatible types."""
+        vector_store.add_documents(
+            documents=["a"],
+            metadatas=[
+                {
+                    "title": "T",
+                    "n": 1,
+                    "score": 0.5,
+                    "ok": True,
+                    "labels": ["x", "y"],
+                    "pair": ("p", 1),
+                    "other": None,
+                }
+            ],
+            ids=["1"],
+        )
+
+        metadata = vector_store.collection.add.call_args.kwargs["metadatas"][0]
+        assert metadata == {
+            "title": "T",
+            "n": 1,
+            "score": 0.5,
+            "ok": True,
+            "labels_raw": "x,y",
+            "labels__x": True,
+            "labels__y": True,
+            "pair": "p,1",
+            "other": "None",
+        }
+
+    def test_list_metadata_expansion_is_capped(self, vector_store: VectorStore):
+        """Test list items become slugged boolean keys, capped per list."""
+        labels = ["Data Base", "data-base"] + [f"tag{i}" for i in range(20)]
+
+        vector_store.add_documents(documents=["a"], metadatas=[{"labels": labels}], ids=["1"])
+
+        metadata = vector_store.collection.add.call_args.kwargs["metadatas"][0]
+        flags = [key for key in metadata if key.startswith("labels__")]
+        assert flags[0] == "labels__data_base"
+        assert len(flags) == 16
+        assert metadata["labels_raw"].startswith("Data Base,data-base,tag0")
+
+    def test_add_documents_schema(self, vector_store: VectorStore):
+        """Test column-wise metadata becomes per-row dicts of Python scalars."""
+        vector_store.add_documents_schema(
+            documents=["a", "b"],
+            metadata_columns={
+                "severity": np.array([1, 2], dtype=np.int32),
+                "source": np.array(["x", "y"]),
+            },
+            ids=["1", "2"],
+        )
+
+        metadatas = vector_store.collection.add.call_args.kwargs["metadatas"]
+        assert metadatas == [{"severity": 1, "source": "x"}, {"severity": 2, "source": "y"}]
+        assert all(type(m["severity"]) is int for m in metadatas)
+
+    def test_add_documents_schema_normalizes_untyped_columns(self, vector_store: VectorStore):
+        """Test list columns fall back to the regular metadata normalization."""
+        vector_store.add_documents_schema(
+            documents=["a"],
+            metadata_columns={"labels": [["vpn"]], "owner": [None]},
+            ids=["1"],
+        )
+
+        metadata = vector_store.collection.add.call_args.kwargs["metadatas"][0]
+        assert metadata == {"labels_raw": "vpn", "labels__vpn": True, "owner": "None"}
+
+    def test_get_and_delete_by_ids_are_chunked(self, vector_store: VectorStore):
+        """Test large ID lists are split into bounded chunks and results merged."""
+        vector_store.ID_CHUNK_SIZE = 2
+        vector_store.collection.get.side_effect = lambda ids, **kwargs: {
+            "ids": list(ids),
+            "documents": [f"doc {i}" for i in ids],
+            "metadatas": [{} for _ in ids],
+            "embeddings": None,
+            "included": ["documents", "metadatas"],
+        }
+        ids = ["1", "2", "3", "4", "5"]
+
+        results = vector_store.get_by_ids(ids)
+        vector_store.delete_by_ids(ids)
+
+        assert vector_store.collection.get.call_count == 3
+        assert results["ids"] == ids
+        assert results["documents"] == [f"doc {i}" for i in ids]
+        assert results["embeddings"] is None
+        assert results["included"] == ["documents", "metadatas"]
+        deleted = [call.kwargs["ids"] for call in vector_store.collection.delete.call_args_list]
+        assert deleted == [["1", "2"], ["3", "4"], ["5"]]
+
+    def test_count_cached_until_write(self, vector_store: VectorStore):
+        """Test count() reuses the last result until a write invalidates it."""
+        vector_store.collection.count.reset_mock()
+        vector_store.collection.count.return_value = 3
+        vector_store._count_cache = None  # drop the value cached during __init__
+
+        assert vector_store.count() == 3
+        assert vector_store.count() == 3
+        assert vector_store.collection.count.call_count == 1
+
+        vector_store.collection.count.return_value = 4
+        vector_store.add_documents(documents=["a"], metadatas=[{}], ids=["1"])
+
+        assert vector_store.count() == 4
+
+    def test_collection_created_with_hnsw_params(self, vector_store: VectorStore):
+        """Test the collection is created with the configured HNSW parameters."""
+        create = vector_store.client.get_or_create_collection
+        metadata = create.call_args.kwargs["metadata"]
+
+        assert metadata["hnsw:space"] == "cosine"
+        assert metadata["hnsw:M"] == vector_store.settings.hnsw_m
+        assert metadata["hnsw:construction_ef"] == vector_store.settings.hnsw_construction_ef
+        assert metadata["hnsw:search_ef"] == vector_store.settings.hnsw_search_ef
+
+
+class TestEmbeddingAccumulator:
+    """Test EmbeddingAccumulator class."""
+
+    def test_grows_and_flushes_contiguous_rows(self, vector_store: VectorStore):
+        """Test rows survive capacity doubling and flush as one float32 array."""
+        accumulator = EmbeddingAccumulator(dim=2, initial_capacity=1)
+        for i in range(3):
+            accumulator.add([float(i), float(i)], str(i), {"n": i}, f"doc {i}")
+
+        with patch.object(vector_store, "add_documents") as add_documents:
+            assert accumulator.flush_to(vector_store) == 3
+
+        args, kwargs = add_documents.call_args
+        documents, metadatas, ids = args
+        assert documents == ["doc 0", "doc 1", "doc 2"]
+        assert metadatas == [{"n": 0}, {"n": 1}, {"n": 2}]
+        assert ids == ["0", "1", "2"]
+        assert kwargs["embeddings"].dtype == np.float32
+        assert kwargs["embeddings"].tolist() == [[0.0, 0.0], [1.0, 1.0], [2.0, 2.0]]
+        assert len(accumulator) == 0
+
+
+class TestVectorStoreSetup:
+    """Test VectorStore per-path setup caching."""
+
+    def test_client_and_directory_setup_shared_per_path(self, settings: Settings, tmp_path):
+        """Test a second store on the same path reuses the client and skips mkdir."""
+        store_settings = settings.model_copy(update={"vectordb_path": str(tmp_path / "db")})
+
+        with patch("src.rag.vector_store.chromadb.PersistentClient") as client_cls, patch(
+            "src.rag.vector_store.Path.mkdir"
+        ) as mkdir:
+            first = VectorStore(store_settings)
+            second = VectorStore(store_settings)
+
+        assert client_cls.call_count == 1
+        assert mkdir.call_count == 1
+        assert first.client is second.client